@@ -14,6 +14,99 @@ from __future__ import (
 # ======================================================================
 # :: Python Standard Library Imports
 import os  # Miscellaneous operating system interfaces
+import sys  # System-specific parameters and functions
+import time  # Time access and conversions
+import importlib  # The implementation of import
+
+
+# ======================================================================
+# :: quick and dirty import timing facility
+_IMPORTS = []
+
+
+# ======================================================================
+def profile_imports(imports=_IMPORTS):
+    """
+    Record the time spent on each (first) import from now on.
+
+    Args:
+        imports (list[tuple]): The list where import events are appended.
+            Each event is a 4-tuple: (name, self time, total time, depth),
+            with times in seconds.
+
+    Returns:
+        None.
+    """
+    try:
+        import builtins
+    except ImportError:
+        import __builtin__ as builtins
+    stack = [0.0]
+
+    def _timed(import_func):
+        def _import(name, *_args, **_kws):
+            if name in sys.modules or _kws.get('level', 0) \
+                    or len(_args) > 3 and _args[3]:
+                return import_func(name, *_args, **_kws)
+            stack.append(0.0)
+            begin_time = time.time()
+            try:
+                return import_func(name, *_args, **_kws)
+            finally:
+                duration = time.time() - begin_time
+                children_duration = stack.pop()
+                stack[-1] += duration
+                imports.append(
+                    (name, duration - children_duration, duration,
+                     len(stack) - 1))
+
+        return _import
+
+    builtins.__import__ = _timed(builtins.__import__)
+    importlib.import_module = _timed(importlib.import_module)
+
+
+# ======================================================================
+def report_imports(
+        imports=_IMPORTS,
+        title='Import Time(s)',
+        labels=('Module', 'Self / s', 'Total / s'),
+        max_col_widths=(48, 12, 12),
+        max_lines=48):
+    """
+    Tabulate the import times, sorted by decreasing total time.
+
+    Args:
+        imports (list[tuple]): The import events.
+            See `profile_imports()` for more info.
+        title (str): The heading of the report.
+        labels (Iterable[str]): Labels for the report.
+            Three elements are expected.
+        max_col_widths (Iterable[int]): Maximum width of columns.
+            Three elements are expected.
+        max_lines (int|None): The maximum number of imports to report.
+
+    Returns:
+        text (str): The report.
+    """
+    fmtt = '{{!s:{}s}}  {{:>{}}}  {{:>{}}}\n'.format(*max_col_widths)
+    text = '\n' + title + '\n' + '=' * len(title) + '\n'
+    text += fmtt.format(*labels)
+    text += fmtt.format(*['-' * width for width in max_col_widths])
+    for name, self_time, total_time, depth in sorted(
+            imports, key=lambda x: -x[2])[:max_lines]:
+        text += fmtt.format(
+            ('  ' * depth + name)[:max_col_widths[0]],
+            '{:.6f}'.format(self_time), '{:.6f}'.format(total_time))
+    text += fmtt.format(
+        'TOTAL', '', '{:.6f}'.format(
+            sum(x[2] for x in imports if x[3] == 0)))
+    return text
+
+
+# : must be enabled before any (measured) import takes place
+if '--profile-startup' in sys.argv[1:]:
+    profile_imports()
 
 # ======================================================================
 # :: External Imports
@@ -61,12 +154,21 @@ MY_GREETINGS = r"""
 """
 # generated with: figlet 'NumEx' -f standard
 
-# :: Causes the greetings to be printed any time the library is loaded.
-print(MY_GREETINGS)
-
 # ======================================================================
 PATH = pkg_paths(__file__, INFO['name'], INFO['author'], INFO['version'])
 
+# :: Submodules imported only upon first access
+_SUBMODULES = ('gui_tk_mpl', 'interactive_tk_mpl', 'lazy', 'plugins')
+
+
+# ======================================================================
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(__name__ + '.' + name)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
 # ======================================================================
 elapsed(os.path.basename(__file__))
 
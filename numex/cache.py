@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumEx: bounded caches of computed data.
+
+Data which is expensive to obtain (e.g. slices of memory-mapped or
+lazily-loaded arrays, prepared for display) is kept in memory, discarding
+the least recently used items once the cache exceeds its size.
+Items can also be computed in advance (prefetched) in background threads.
+
+All caches share a global memory budget (see `BUDGET`), whose limit can be
+set with the `NUMEX_CACHE_BUDGET` environment variable (in bytes, possibly
+with a unit suffix, e.g. `512M` or `4G`).
+When the budget is exceeded, items are discarded across all caches,
+preferring items that were used least recently, are large, and were cheap
+to compute.
+"""
+
+# ======================================================================
+# :: Future Imports
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals, )
+
+# ======================================================================
+# :: Python Standard Library Imports
+import os  # Miscellaneous operating system interfaces
+import sys  # System-specific parameters and functions
+import time  # Time access and conversions
+import weakref  # Weak references
+import threading  # Thread-based parallelism
+import collections  # Container datatypes
+import concurrent.futures  # Launching parallel tasks
+
+# ======================================================================
+# :: External Imports
+import numpy as np  # NumPy (multidimensional numerical arrays library)
+
+# number of threads used for prefetching
+PREFETCH_WORKERS = 2
+
+# environment variable for the memory budget of all caches
+BUDGET_ENV = 'NUMEX_CACHE_BUDGET'
+# default memory budget of all caches (in bytes)
+D_BUDGET = 2 ** 30
+# minimum cost (in s) of an item, for weighting its eviction
+MIN_COST = 1e-3
+
+SIZE_UNITS = ('', 'K', 'M', 'G', 'T')
+
+# :: Prefetching thread pool, created upon first use
+_PREFETCH = {}
+
+
+# ======================================================================
+def parse_size(text):
+    """
+    Parse a size in bytes, possibly with a (binary) unit suffix.
+
+    Args:
+        text (str|int): The size.
+
+    Returns:
+        size (int): The size in bytes.
+
+    Raises:
+        ValueError: If the size cannot be parsed.
+
+    Examples:
+        >>> parse_size('1024')
+        1024
+        >>> parse_size('1.5K')
+        1536
+        >>> parse_size('2GiB')
+        2147483648
+    """
+    text = str(text).strip().upper()
+    for suffix in ('IB', 'B'):
+        if text.endswith(suffix):
+            text = text[:-len(suffix)]
+            break
+    factor = 1
+    if text and text[-1] in SIZE_UNITS[1:]:
+        factor = 1024 ** SIZE_UNITS.index(text[-1])
+        text = text[:-1]
+    try:
+        return int(float(text) * factor)
+    except ValueError:
+        text = 'Cannot parse size `{}`.'.format(text)
+        raise ValueError(text)
+
+
+# ======================================================================
+def fmt_size(size):
+    """
+    Format a size in bytes with a (binary) unit suffix.
+
+    Args:
+        size (int): The size in bytes.
+
+    Returns:
+        text (str): The formatted size.
+
+    Examples:
+        >>> fmt_size(512)
+        '512 B'
+        >>> fmt_size(3 * 2 ** 29)
+        '1.5 GiB'
+    """
+    for i, unit in enumerate(SIZE_UNITS):
+        if size < 1024 ** (i + 1) or i == len(SIZE_UNITS) - 1:
+            break
+    if i == 0:
+        return '{} B'.format(size)
+    else:
+        return '{:.1f} {}iB'.format(size / 1024 ** i, unit)
+
+
+# ======================================================================
+class Budget(object):
+    """
+    Memory budget shared by multiple caches.
+
+    Examples:
+        >>> budget = Budget(limit=100)
+        >>> cache_a = LRUCache(budget=budget)
+        >>> cache_b = LRUCache(budget=budget)
+        >>> cache_a.put('x', np.zeros(4), cost=1.0)
+        >>> cache_b.put('y', np.zeros(4), cost=0.0)
+        >>> cache_b.put('z', np.zeros(4), cost=0.0)
+        >>> budget.usage
+        96
+        >>> cache_a.put('w', np.zeros(4), cost=1.0)
+        >>> budget.usage, cache_a.keys(), cache_b.keys()
+        (96, ['x', 'w'], ['z'])
+    """
+
+    def __init__(self, limit=None):
+        """
+        Args:
+            limit (int|None): The maximum size of all caches in bytes.
+                If None, the size is unbounded.
+        """
+        self.limit = limit
+        self._caches = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def register(self, cache):
+        """
+        Register a cache, so that its items count toward the budget.
+
+        Args:
+            cache (LRUCache): The cache.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._caches.add(cache)
+
+    @property
+    def caches(self):
+        with self._lock:
+            return list(self._caches)
+
+    @property
+    def usage(self):
+        return sum(cache.size for cache in self.caches)
+
+    def status(self):
+        """
+        Describe the memory usage of the caches.
+
+        Returns:
+            text (str): The memory usage.
+        """
+        if self.limit is None:
+            return 'Cache: {}'.format(fmt_size(self.usage))
+        else:
+            return 'Cache: {} / {}'.format(
+                fmt_size(self.usage), fmt_size(self.limit))
+
+    def enforce(self):
+        """
+        Discard items from the caches until the budget is met.
+
+        At each step, the least recently used item of each cache is
+        considered, and the item with the largest product of time since
+        last use and size, per unit of computation cost, is discarded.
+        The most recently used item of each cache is never discarded.
+
+        Returns:
+            None.
+        """
+        if self.limit is None:
+            return
+        caches = self.caches
+        usage = sum(cache.size for cache in caches)
+        while usage > self.limit:
+            now = time.time()
+            victims = []
+            for cache in caches:
+                oldest = cache.oldest()
+                if oldest is not None:
+                    key, size, cost, last_used = oldest
+                    score = (now - last_used) * size / max(cost, MIN_COST)
+                    victims.append((score, size, id(cache), cache, key))
+            if not victims:
+                break
+            score, size, cache_id, cache, key = max(victims)
+            if cache.pop(key, None) is not None:
+                usage -= size
+            else:
+                usage = sum(cache.size for cache in caches)
+
+
+# ======================================================================
+def _budget_limit():
+    if BUDGET_ENV in os.environ:
+        return parse_size(os.environ[BUDGET_ENV])
+    else:
+        return D_BUDGET
+
+
+# :: Memory budget shared by all caches
+BUDGET = Budget(_budget_limit())
+
+
+# ======================================================================
+def sizeof(obj):
+    """
+    Estimate the memory used by an object.
+
+    Arrays (also nested in tuples, lists or dicts) are accounted for with
+    the size of their data.
+
+    Args:
+        obj (Any): The input object.
+
+    Returns:
+        size (int): The size in bytes.
+
+    Examples:
+        >>> sizeof(np.zeros((2, 3)))
+        48
+        >>> sizeof((np.zeros(4), np.zeros(4, dtype=np.uint8)))
+        36
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, (tuple, list)):
+        return sum(sizeof(x) for x in obj)
+    elif isinstance(obj, dict):
+        return sum(sizeof(x) for x in obj.values())
+    else:
+        return sys.getsizeof(obj)
+
+
+# ======================================================================
+class LRUCache(object):
+    """
+    Thread-safe least-recently-used cache, bounded by the size of its items.
+
+    The cache is also bounded by the memory budget it is registered with.
+
+    Examples:
+        >>> cache = LRUCache(max_size=150, budget=None)
+        >>> cache['a'] = np.zeros(8)
+        >>> cache['b'] = np.zeros(4)
+        >>> cache.get('a').shape
+        (8,)
+        >>> cache['c'] = np.zeros(8)
+        >>> list(cache.keys())
+        ['a', 'c']
+        >>> cache.size
+        128
+    """
+
+    def __init__(
+            self,
+            max_size=None,
+            sizeof=sizeof,
+            budget=BUDGET):
+        """
+        Args:
+            max_size (int|None): The maximum size of the cache in bytes.
+                The most recent item is always kept, even if larger.
+                If None, the size is only bounded by the budget.
+            sizeof (callable): Compute the size of an item in bytes.
+            budget (Budget|None): The memory budget of the cache.
+                If None, the cache does not count toward any budget.
+        """
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.budget = budget
+        self.size = 0
+        self._items = collections.OrderedDict()
+        # : the futures of the items being prefetched
+        self._pending = {}
+        self._lock = threading.RLock()
+        if budget is not None:
+            budget.register(self)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def is_pending(self, key):
+        """
+        Determine if an item is being computed in background.
+
+        Args:
+            key (Hashable): The item key.
+
+        Returns:
+            result (bool): True if the item is being prefetched.
+        """
+        with self._lock:
+            return key in self._pending
+
+    def keys(self):
+        with self._lock:
+            return list(self._items.keys())
+
+    def get(self, key, default=None):
+        """
+        Get an item, marking it as the most recently used.
+
+        Args:
+            key (Hashable): The item key.
+            default (Any): The value returned if the item is not cached.
+
+        Returns:
+            value (Any): The item value.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                value, size, cost, last_used = self._items[key]
+                self._items[key] = value, size, cost, time.time()
+                return value
+            else:
+                return default
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key not in self._items:
+                raise KeyError(key)
+            return self.get(key)
+
+    def put(self, key, value, cost=0.0):
+        """
+        Store an item, marking it as the most recently used.
+
+        Args:
+            key (Hashable): The item key.
+            value (Any): The item value.
+            cost (float): The cost of computing the item in s.
+                This is used to weight the eviction across caches.
+
+        Returns:
+            None.
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._items:
+                self.size -= self._items.pop(key)[1]
+            self._items[key] = value, size, cost, time.time()
+            self.size += size
+            self.shrink()
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                value, size, cost, last_used = self._items.pop(key)
+                self.size -= size
+                return value
+            else:
+                return default
+
+    def oldest(self):
+        """
+        Describe the least recently used item, if it can be discarded.
+
+        Returns:
+            result (tuple|None): The tuple
+                contains:
+                 - key (Hashable): The item key.
+                 - size (int): The item size in bytes.
+                 - cost (float): The item cost in s.
+                 - last_used (float): The time of last use in s.
+                If the cache has less than two items, None is returned.
+        """
+        with self._lock:
+            if len(self._items) > 1:
+                key = next(iter(self._items))
+                value, size, cost, last_used = self._items[key]
+                return key, size, cost, last_used
+            else:
+                return None
+
+    def shrink(self, max_size=None):
+        """
+        Discard the least recently used items exceeding the maximum size.
+
+        Args:
+            max_size (int|None): The maximum size of the cache in bytes.
+                If None, the maximum size of the cache is used.
+
+        Returns:
+            None.
+        """
+        if max_size is None:
+            max_size = self.max_size
+        if max_size is None:
+            return
+        with self._lock:
+            while self.size > max_size and len(self._items) > 1:
+                key, item = self._items.popitem(last=False)
+                self.size -= item[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def compute(self, key, func, *_args, **_kws):
+        """
+        Get an item, computing (and caching) it if not cached.
+
+        If the item is being prefetched, its result is awaited instead of
+        computing it again.
+
+        Args:
+            key (Hashable): The item key.
+            func (callable): Compute the item value.
+                Must accept the key as first argument.
+            *_args: Positional arguments for `func`.
+            **_kws: Keyword arguments for `func`.
+
+        Returns:
+            value (Any): The item value.
+
+        Examples:
+            >>> cache = LRUCache(budget=None)
+            >>> ready, calls = threading.Event(), []
+            >>> def func(key):
+            ...     calls.append(key)
+            ...     ready.wait()
+            ...     return key * 2
+            >>> cache.prefetch([1], func)
+            >>> threading.Timer(0.1, ready.set).start()
+            >>> cache.compute(1, func), calls
+            (2, [1])
+        """
+        marker = self._items  # : any object which is never an item value
+        value = self.get(key, marker)
+        if value is marker:
+            with self._lock:
+                future = self._pending.get(key)
+            if future is not None:
+                return future.result()
+            begin_time = time.time()
+            value = func(key, *_args, **_kws)
+            self.put(key, value, time.time() - begin_time)
+        return value
+
+    def prefetch(self, keys, func, *_args, **_kws):
+        """
+        Compute (and cache) items in background threads, if not cached.
+
+        Items already being computed are not submitted again.
+
+        Args:
+            keys (Iterable[Hashable]): The item keys.
+            func (callable): Compute the item value.
+                Must accept the key as first argument.
+            *_args: Positional arguments for `func`.
+            **_kws: Keyword arguments for `func`.
+
+        Returns:
+            None.
+        """
+        if 'executor' not in _PREFETCH:
+            _PREFETCH['executor'] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=PREFETCH_WORKERS,
+                thread_name_prefix='numex-prefetch')
+        for key in keys:
+            with self._lock:
+                if key in self._items or key in self._pending:
+                    continue
+                # : the future is registered before the item computation
+                #   may complete, as this requires the lock
+                self._pending[key] = _PREFETCH['executor'].submit(
+                    self._prefetch, key, func, *_args, **_kws)
+
+    def _prefetch(self, key, func, *_args, **_kws):
+        try:
+            with self._lock:
+                if key in self._items:
+                    return self._items[key][0]
+            begin_time = time.time()
+            value = func(key, *_args, **_kws)
+            if key not in self._items:
+                self.put(key, value, time.time() - begin_time)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumEx: reduction of the data to the resolution of the display.
+
+Large data is reduced to (at most) what can actually be shown on screen
+before being handed to the plotting library, so that the rendering time
+is bounded by the number of screen pixels rather than by the data size.
+"""
+
+# ======================================================================
+# :: Future Imports
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals, )
+
+# ======================================================================
+# :: Python Standard Library Imports
+import functools  # Higher-order functions and operations on callable objects
+
+# ======================================================================
+# :: External Imports
+import numpy as np  # NumPy (multidimensional numerical arrays library)
+
+
+# ======================================================================
+def minmax_decimate(
+        x_arr,
+        y_arr,
+        n_bins,
+        x_lim=None):
+    """
+    Reduce a trace to its min/max envelope over a number of bins.
+
+    The samples within the x-axis limits are split into (at most) `n_bins`
+    consecutive bins, and only the minimum and the maximum of each bin are
+    kept (in their original order), so that a line through the reduced
+    samples looks the same as the full trace when each bin spans (at most)
+    one pixel.
+    The samples just outside the limits are kept, so that the line extends
+    beyond the limits.
+
+    Args:
+        x_arr (np.ndarray): The x-axis data.
+            Must be sorted in increasing order.
+        y_arr (np.ndarray): The y-axis data.
+        n_bins (int): The number of bins, e.g. the width in pixels.
+        x_lim (Sequence[float]|None): The x-axis limits.
+            If None, all the samples are used.
+
+    Returns:
+        result (tuple): The tuple
+            contains:
+             - x_arr (np.ndarray): The reduced x-axis data.
+             - y_arr (np.ndarray): The reduced y-axis data.
+
+    Examples:
+        >>> x_arr = np.arange(10)
+        >>> y_arr = np.array([0, 5, 1, 2, 3, -1, 4, 4, 0, 9])
+        >>> minmax_decimate(x_arr, y_arr, 2)
+        (array([0, 1, 5, 9]), array([ 0,  5, -1,  9]))
+        >>> minmax_decimate(x_arr, y_arr, 2, (2.5, 5.5))
+        (array([2, 4, 5, 6]), array([ 1,  3, -1,  4]))
+    """
+    if x_lim is not None:
+        x_min, x_max = sorted(x_lim)
+        first = max(0, np.searchsorted(x_arr, x_min, 'right') - 1)
+        last = np.searchsorted(x_arr, x_max, 'left') + 1
+        x_arr = x_arr[first:last]
+        y_arr = y_arr[first:last]
+    size = len(y_arr)
+    n_bins = max(1, int(n_bins))
+    if size <= 2 * n_bins:
+        return x_arr, y_arr
+    bin_size = -(-size // n_bins)
+    n_bins = -(-size // bin_size)
+    bins = np.pad(
+        y_arr, (0, n_bins * bin_size - size), 'edge').reshape(
+        (n_bins, bin_size))
+    offsets = np.arange(n_bins) * bin_size
+    indexes = np.stack(
+        [offsets + np.argmin(bins, axis=1),
+         offsets + np.argmax(bins, axis=1)], axis=1)
+    indexes = np.minimum(np.sort(indexes, axis=1).ravel(), size - 1)
+    return x_arr[indexes], y_arr[indexes]
+
+
+# ======================================================================
+def clip_xy(
+        x_arr,
+        y_arr,
+        x_lim,
+        y_lim):
+    """
+    Select the points of a trajectory within the axes limits.
+
+    The points next to the selected ones are also kept, so that the
+    segments crossing the limits are preserved, while discontinuities
+    in the selection are marked by NaN values.
+
+    Args:
+        x_arr (np.ndarray): The x-axis data.
+        y_arr (np.ndarray): The y-axis data.
+        x_lim (Sequence[float]): The x-axis limits.
+        y_lim (Sequence[float]): The y-axis limits.
+
+    Returns:
+        result (tuple): The tuple
+            contains:
+             - x_arr (np.ndarray): The selected x-axis data.
+             - y_arr (np.ndarray): The selected y-axis data.
+             - n_inside (int): The number of points within the limits.
+
+    Examples:
+        >>> x_arr = np.arange(8.0)
+        >>> y_arr = np.array([0., 0., 5., 5., 5., 0., 0., 0.])
+        >>> x_arr, y_arr, n_inside = clip_xy(
+        ...     x_arr, y_arr, (0.5, 6.5), (-1, 1))
+        >>> x_arr
+        array([ 0.,  1.,  2., nan,  4.,  5.,  6.,  7.])
+        >>> y_arr
+        array([ 0.,  0.,  5., nan,  5.,  0.,  0.,  0.])
+        >>> n_inside
+        3
+    """
+    x_min, x_max = sorted(x_lim)
+    y_min, y_max = sorted(y_lim)
+    mask = (x_arr >= x_min) & (x_arr <= x_max) \
+        & (y_arr >= y_min) & (y_arr <= y_max)
+    n_inside = int(np.count_nonzero(mask))
+    mask[:-1] |= mask[1:]
+    mask[1:] |= mask[:-1].copy()
+    indexes = np.flatnonzero(mask)
+    breaks = np.flatnonzero(np.diff(indexes) > 1) + 1
+    x_arr = np.insert(x_arr[indexes].astype(float), breaks, np.nan)
+    y_arr = np.insert(y_arr[indexes].astype(float), breaks, np.nan)
+    return x_arr, y_arr, n_inside
+
+
+# ======================================================================
+def density(
+        x_arr,
+        y_arr,
+        shape,
+        x_lim,
+        y_lim):
+    """
+    Compute the density of points within the axes limits.
+
+    Args:
+        x_arr (np.ndarray): The x-axis data.
+        y_arr (np.ndarray): The y-axis data.
+        shape (Sequence[int]): The number of bins along the y-axis and the
+            x-axis, e.g. the height and the width in pixels.
+        x_lim (Sequence[float]): The x-axis limits.
+        y_lim (Sequence[float]): The y-axis limits.
+
+    Returns:
+        hist (np.ndarray): The number of points in each bin.
+            The first axis runs along the y-axis (in increasing order),
+            the second axis runs along the x-axis (in increasing order),
+            suitable for `imshow(..., origin='lower')`.
+
+    Examples:
+        >>> density(
+        ...     np.array([0.1, 0.2, 0.9]), np.array([0.1, 0.9, 0.9]),
+        ...     (2, 2), (0, 1), (0, 1))
+        array([[1., 0.],
+               [1., 1.]])
+    """
+    # : same binning as `np.histogram2d()` (the last bin includes the upper
+    #   limit), but using index arithmetic and `np.bincount()`, which is faster
+    (y_min, y_max), (x_min, x_max) = sorted(y_lim), sorted(x_lim)
+    mask = (x_arr >= x_min) & (x_arr <= x_max) \
+        & (y_arr >= y_min) & (y_arr <= y_max)
+    indices = 0
+    for arr, min_val, max_val, size in zip(
+            (y_arr[mask], x_arr[mask]), (y_min, x_min), (y_max, x_max),
+            shape):
+        scale = size / (max_val - min_val) if max_val > min_val else 0.0
+        indices = indices * size + np.minimum(
+            ((arr - min_val) * scale).astype(np.intp), size - 1)
+    return np.bincount(
+        indices, minlength=shape[0] * shape[1]).reshape(shape).astype(float)
+
+
+# ======================================================================
+def pyramid(
+        img,
+        min_size=512):
+    """
+    Compute the coarser levels of the multi-resolution pyramid of an image.
+
+    Each level is obtained by averaging blocks of 2x2 pixels of the
+    previous level (the last row or column is repeated for odd sizes).
+
+    Args:
+        img (np.ndarray): The input 2D image.
+        min_size (int): The size of the coarsest level.
+            Levels are computed until both dimensions fit this size.
+
+    Returns:
+        levels (tuple[np.ndarray]): The coarser levels.
+            The i-th level is downsampled by a factor of 2 ** (i + 1).
+
+    Examples:
+        >>> img = np.arange(5 * 6, dtype=float).reshape((5, 6))
+        >>> [level.shape for level in pyramid(img, 2)]
+        [(3, 3), (2, 2)]
+        >>> pyramid(img, 3)[0]
+        array([[ 3.5,  5.5,  7.5],
+               [15.5, 17.5, 19.5],
+               [24.5, 26.5, 28.5]])
+    """
+    levels = []
+    while max(img.shape) > min_size:
+        img = np.pad(
+            img, [(0, dim % 2) for dim in img.shape], 'edge')
+        img = img.reshape(
+            (img.shape[0] // 2, 2, img.shape[1] // 2, 2)).mean(axis=(1, 3))
+        levels.append(img)
+    return tuple(levels)
+
+
+# ======================================================================
+def pyramid_level(
+        view_shape,
+        screen_shape,
+        n_levels):
+    """
+    Select the pyramid level matching the resolution of the screen.
+
+    This is the coarsest level still having (at least) one pixel per
+    screen pixel.
+
+    Args:
+        view_shape (Sequence[float]): The size of the visible region
+            in pixels of the (full resolution) image.
+        screen_shape (Sequence[float]): The size of the visible region
+            in pixels of the screen.
+        n_levels (int): The number of coarser levels available.
+
+    Returns:
+        level (int): The level, where 0 is the full resolution image.
+
+    Examples:
+        >>> pyramid_level((4000, 3000), (500, 700), 8)
+        2
+        >>> pyramid_level((400, 300), (500, 700), 8)
+        0
+    """
+    ratio = min(
+        view_dim / max(screen_dim, 1)
+        for view_dim, screen_dim in zip(view_shape, screen_shape))
+    level = int(np.floor(np.log2(ratio))) if ratio > 0 else 0
+    return min(max(level, 0), n_levels)
+
+
+# ======================================================================
+def pyramid_region(
+        img,
+        level,
+        x_lim,
+        y_lim):
+    """
+    Extract the visible region of a pyramid level.
+
+    Args:
+        img (np.ndarray): The image of the pyramid level.
+        level (int): The pyramid level, where 0 is the full resolution.
+        x_lim (Sequence[float]): The x-axis limits.
+            These are in pixels of the full resolution image.
+        y_lim (Sequence[float]): The y-axis limits.
+            These are in pixels of the full resolution image.
+
+    Returns:
+        result (tuple): The tuple
+            contains:
+             - region (np.ndarray): The visible region.
+             - extent (tuple[float]): The extent of the region in pixels
+               of the full resolution image, as expected by `imshow()`
+               with `origin='lower'`.
+
+    Examples:
+        >>> img = np.arange(4 * 4).reshape((4, 4))
+        >>> pyramid_region(img, 0, (1.5, 3.0), (-0.5, 1.0))
+        (array([[2, 3],
+               [6, 7]]), (1.5, 3.5, -0.5, 1.5))
+        >>> pyramid_region(img, 1, (1.5, 3.0), (-0.5, 1.0))
+        (array([[1]]), (1.5, 3.5, -0.5, 1.5))
+    """
+    factor = 2 ** level
+    index = []
+    bounds = []
+    for lim, dim in zip((y_lim, x_lim), img.shape):
+        first = int(np.floor((min(lim) + 0.5) / factor))
+        last = int(np.ceil((max(lim) + 0.5) / factor))
+        first, last = min(max(first, 0), dim - 1), min(max(last, 1), dim)
+        index.append(slice(first, last))
+        bounds.append((first * factor - 0.5, last * factor - 0.5))
+    (y_min, y_max), (x_min, x_max) = bounds
+    return img[tuple(index)], (x_min, x_max, y_min, y_max)
+
+
+# ======================================================================
+@functools.lru_cache(maxsize=64)
+def colormap_lut(cmap):
+    """
+    Compute the lookup table (LUT) of a colormap.
+
+    Args:
+        cmap (str): The colormap name.
+
+    Returns:
+        result (tuple): The tuple
+            contains:
+             - lut (np.ndarray): The RGBA colors of the colormap, as uint8.
+             - bad (np.ndarray): The RGBA color for invalid values, as uint8.
+
+    Examples:
+        >>> lut, bad = colormap_lut('gray')
+        >>> lut.shape, lut.dtype
+        ((256, 4), dtype('uint8'))
+        >>> lut[[0, -1]]
+        array([[  0,   0,   0, 255],
+               [255, 255, 255, 255]], dtype=uint8)
+    """
+    import matplotlib.cm
+
+    cmap = matplotlib.cm.get_cmap(cmap) \
+        if not hasattr(matplotlib, 'colormaps') else matplotlib.colormaps[cmap]
+    lut = cmap(np.arange(cmap.N), bytes=True)
+    bad = cmap(np.ma.masked_invalid([np.nan]), bytes=True)[0]
+    lut.flags.writeable = False
+    bad.flags.writeable = False
+    return lut, bad
+
+
+# ======================================================================
+def apply_lut(
+        img,
+        clim,
+        lut,
+        bad=None,
+        out=None):
+    """
+    Map an image to RGBA colors using a colormap lookup table (LUT).
+
+    The image is quantized to the LUT indices (as uint8 or uint16) and the
+    colors are gathered in a single vectorized operation, avoiding the
+    floating-point temporaries of the generic normalization and colormap
+    evaluation, while producing the same colors.
+
+    Args:
+        img (np.ndarray): The input 2D image.
+        clim (Sequence[float|None]): The values mapped to the first and
+            the last color of the LUT. Values outside are clipped.
+            If any is None (e.g. for data without finite values), all
+            values are mapped to the first color.
+        lut (np.ndarray): The RGBA colors of the colormap.
+        bad (np.ndarray|None): The RGBA color for invalid values.
+            If None, invalid values are not handled specially.
+        out (np.ndarray|None): The output buffer.
+            If None or not matching the image shape, a new one is created.
+
+    Returns:
+        out (np.ndarray): The RGBA image.
+
+    Examples:
+        >>> lut, bad = colormap_lut('gray')
+        >>> apply_lut(np.array([[0.0, 0.5, 1.0, np.nan]]), (0, 1), lut, bad)
+        array([[[  0,   0,   0, 255],
+                [128, 128, 128, 255],
+                [255, 255, 255, 255],
+                [  0,   0,   0,   0]]], dtype=uint8)
+        >>> apply_lut(np.array([[np.nan]]), (None, None), lut, bad)
+        array([[[0, 0, 0, 0]]], dtype=uint8)
+    """
+    n_colors = len(lut)
+    shape = img.shape + lut.shape[1:]
+    if out is None or out.shape != shape or out.dtype != lut.dtype:
+        out = np.empty(shape, dtype=lut.dtype)
+    vmin, vmax = clim
+    if vmin is None or vmax is None:
+        vmin = vmax = 0.0
+    scale = n_colors / (vmax - vmin) if vmax > vmin else 0.0
+    indexes = np.subtract(img, vmin, dtype=np.float32)
+    indexes *= scale
+    np.clip(indexes, 0, n_colors - 1, out=indexes)
+    with np.errstate(invalid='ignore'):
+        # : invalid values are overwritten afterwards
+        indexes = indexes.astype(
+            np.uint8 if n_colors <= 256 else np.uint16)
+    np.take(lut, indexes, axis=0, out=out)
+    if bad is not None:
+        mask = np.isnan(img)
+        if np.any(mask):
+            out[mask] = bad
+    return out
+
+
+# ======================================================================
+@functools.lru_cache(maxsize=64)
+def _unit_steps(num):
+    steps = np.arange(num) / num
+    steps.flags.writeable = False
+    return steps
+
+
+# ======================================================================
+def profile_plan(
+        vertices,
+        shape,
+        step=1.0):
+    """
+    Compute the sampling of a profile along a polyline over an image.
+
+    The polyline is sampled at (at most) `step` intervals, and the indices
+    and the weights of the pixels used for the bilinear interpolation are
+    computed once, so that the profile of any image of the same shape
+    (e.g. other slices, or the parts of complex data) only requires
+    gathering and combining the pixel values (see `sample_profile()`).
+
+    Args:
+        vertices (Iterable[Iterable[float]]): The (x, y) vertices.
+            The x and y coordinates are the column and row indices.
+        shape (Sequence[int]): The shape of the images.
+        step (float): The maximum distance between samples in pixels.
+
+    Returns:
+        plan (dict): The sampling plan
+            contains:
+             - 'dist' (np.ndarray): The distance of the samples along the
+               polyline, in pixels.
+             - 'rows' (tuple[np.ndarray]): The row indices of the pixels
+               before and after the samples.
+             - 'cols' (tuple[np.ndarray]): The column indices of the pixels
+               before and after the samples.
+             - 'weights' (tuple[np.ndarray]): The fractional offsets of the
+               samples along the rows and the columns.
+             - 'valid' (np.ndarray): The samples within the image.
+
+    Examples:
+        >>> plan = profile_plan([(0, 0), (3, 0), (3, 1)], (2, 4))
+        >>> plan['dist'].tolist()
+        [0.0, 1.0, 2.0, 3.0, 4.0]
+        >>> profile_plan([(-2, 0), (0, 0)], (2, 4))['valid'].tolist()
+        [False, False, True]
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    points, dists = [], []
+    length = 0.0
+    for start, stop in zip(vertices[:-1], vertices[1:]):
+        seg_length = np.hypot(*(stop - start))
+        steps = _unit_steps(max(1, int(np.ceil(seg_length / step))))
+        points.append(start + steps[:, None] * (stop - start))
+        dists.append(length + steps * seg_length)
+        length += seg_length
+    points = np.concatenate(points + [vertices[-1:]])
+    dist = np.concatenate(dists + [np.full(1, length)])
+    indices, weights = {}, {}
+    valid = np.ones(len(points), dtype=bool)
+    for name, coords, size in zip(
+            ('cols', 'rows'), points.T, (shape[1], shape[0])):
+        valid &= (coords >= -0.5) & (coords <= size - 0.5)
+        coords = np.clip(coords, 0, size - 1)
+        before = np.minimum(coords.astype(int), max(size - 2, 0))
+        indices[name] = before, np.minimum(before + 1, size - 1)
+        weights[name] = coords - before
+    return dict(
+        dist=dist, rows=indices['rows'], cols=indices['cols'],
+        weights=(weights['rows'], weights['cols']), valid=valid)
+
+
+# ======================================================================
+def sample_profile(
+        img,
+        plan,
+        period=None):
+    """
+    Sample the profile of an image with bilinear interpolation.
+
+    Args:
+        img (np.ndarray): The input 2D image.
+        plan (dict): The sampling plan.
+            This is obtained from `profile_plan()`.
+        period (float|None): The period of the values.
+            If not None, the values (e.g. phases) are interpolated on the
+            unit circle, so that wrapping around the period does not
+            produce spurious intermediate values.
+
+    Returns:
+        profile (np.ndarray): The values of the samples.
+            Samples outside the image are NaN.
+
+    Examples:
+        >>> img = np.arange(8.0).reshape((2, 4))
+        >>> sample_profile(img, profile_plan([(0, 0), (3, 1)], img.shape))
+        array([0.  , 1.75, 3.5 , 5.25, 7.  ])
+        >>> img = np.array([[3.0, -3.0]])
+        >>> plan = profile_plan([(0, 0), (1, 0)], img.shape, 0.5)
+        >>> np.abs(sample_profile(img, plan, 2 * np.pi)).round(4).tolist()
+        [3.0, 3.1416, 3.0]
+    """
+    (row_0, row_1), (col_0, col_1) = plan['rows'], plan['cols']
+    row_weights, col_weights = plan['weights']
+    dtype = np.result_type(img.dtype, float)
+    values = [
+        img[rows, cols].astype(dtype)
+        for rows, cols in (
+            (row_0, col_0), (row_0, col_1), (row_1, col_0), (row_1, col_1))]
+    if period is not None:
+        values = [np.exp(2j * np.pi / period * value) for value in values]
+    value_00, value_01, value_10, value_11 = values
+    before = value_00 + (value_01 - value_00) * col_weights
+    after = value_10 + (value_11 - value_10) * col_weights
+    profile = before + (after - before) * row_weights
+    if period is not None:
+        profile = np.angle(profile) * period / (2 * np.pi)
+    profile[~plan['valid']] = np.nan
+    return profile
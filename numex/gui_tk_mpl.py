@@ -23,32 +23,28 @@ import collections  # Container datatypes
 import traceback  # Print or retrieve a stack traceback
 import textwrap  # Text wrapping and filling
 import multiprocessing  # Process-based parallelism
+import importlib  # The implementation of import
 
 # :: External Imports
 import numpy as np  # NumPy (multidimensional numerical arrays library)
-import flyingcircus as fc  # Everything you always wanted to have in Python*
-import matplotlib.cm, matplotlib.lines, matplotlib.colors
-from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 # :: Local Imports
 import numex as nme
-import numex.interactive_tk_mpl
-from numex.plugins import EXT, synthetic, io_numpy, io_nibabel, io_bart_cfl
+import numex.plugins
+import numex.stats
+import numex.cache
+import numex.display
+import numex.roi
+from numex.cache import LRUCache
+from numex.sharing import SharedArray, ensure_tracker
 
-from numex import INFO, PATH
+from numex import INFO, PATH, MY_GREETINGS
 from numex import VERB_LVL, D_VERB_LVL
 from numex import msg, dbg, fmt, fmtm
 from numex import elapsed, report
 
 TITLE = nme.__doc__.strip().split('\n')[0][:-1]
 
-COLORMAPS = sorted(str(v) for v in matplotlib.cm.datad)
-COLORS = sorted(str(k) for k, v in matplotlib.colors.cnames.items())
-LINESTYLES = sorted(
-    str(k) for k, v in matplotlib.lines.lineStyles.items() if str(k).strip())
-LINEMARKERS = sorted(
-    str(k) for k, v in matplotlib.lines.lineMarkers.items()
-    if str(k).strip() and k not in range(5, 12) and k != 0)
 INTERACTIVE_BASE = collections.OrderedDict([
     ('cx_mode', dict(
         label='Complex Mode', default='real-imag',
@@ -57,29 +53,76 @@ INTERACTIVE_BASE = collections.OrderedDict([
         label='Display Orientation', default='auto',
         values=('auto', 'horizontal', 'vertical'))),
 ])
+# :: Persistent viewer process (see `start_server()`)
+_SERVER = {}
+# interval (in ms) for checking new requests in the viewer process
+SERVER_POLL_INTERVAL = 10
 MODES = {
     '1d': '1D',
     '2d_plot_xy': '2D Plot(x,y)',
     '2d_map': '2D Map',
-    # '2d_map_profile': '2D Map with Profile',
+    '2d_projection': '2D Projection',
+    '3d_ortho': '3D Orthogonal Planes',
+    '2d_map_profile': '2D Map with Profile',
 }
 
 
+# maximum size (in bytes) of the cache of the slices prepared for display
+SLICE_CACHE_SIZE = 2 ** 28
+
+# minimum number of bins for the decimation of the traces for display
+DECIMATION_BINS = 2048
+
+# maximum number of visible points drawn individually, otherwise their density
+# is shown (in the 2D plot mode)
+DENSITY_POINTS = 2 ** 16
+# minimum number of bins along each axis for showing the density of points
+DENSITY_BINS = 256
+
+# minimum number of pixels of 2D maps shown through a multi-resolution pyramid
+PYRAMID_PIXELS = 2 ** 22
+
+# maximum distance (in screen pixels) for picking the vertices of profiles
+PROFILE_PICK_RADIUS = 8
+# interval (in ms) for checking if the ROI curve is ready
+ROI_POLL_INTERVAL = 50
+
+# maximum number of samples of the (subsampled) preview of 1D plots
+PREVIEW_SAMPLES = 2 ** 14
+# maximum number of pixels of the (subsampled) preview of 2D maps
+PREVIEW_PIXELS = 2 ** 16
+
+# :: Tables of values for the widgets, computed only upon first access
+_TABLES = {}
+
+
+# ======================================================================
+def _table(name):
+    if not _TABLES:
+        import matplotlib.cm, matplotlib.lines, matplotlib.colors
+        _TABLES.update(
+            COLORMAPS=sorted(str(v) for v in matplotlib.cm.datad),
+            COLORS=sorted(str(k) for k, v in matplotlib.colors.cnames.items()),
+            LINESTYLES=sorted(
+                str(k) for k, v in matplotlib.lines.lineStyles.items()
+                if str(k).strip()),
+            LINEMARKERS=sorted(
+                str(k) for k, v in matplotlib.lines.lineMarkers.items()
+                if str(k).strip() and k not in range(5, 12) and k != 0))
+    return _TABLES[name]
+
+
+# ======================================================================
+def __getattr__(name):
+    if name in ('COLORMAPS', 'COLORS', 'LINESTYLES', 'LINEMARKERS'):
+        return _table(name)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
 # ======================================================================
 def io_selector(filepath, mode=None):
-    root, ext = fc.split_ext(filepath)
-    if mode is None:
-        if ext[1:] in EXT:
-            loader = EXT[ext[1:]]
-        else:
-            text = fmtm('Could not load data from `{filepath}`.')
-            raise ValueError(text)
-    else:
-        try:
-            loader = EXT[mode]
-        except KeyError:
-            loader = io_selector(filepath, None)
-    return loader
+    return numex.plugins.select(filepath, mode)
 
 
 # ======================================================================
@@ -94,7 +137,7 @@ def plot_selector(
         else:
             mode = '2d_map'
     if mode in MODES:
-        interactives = INTERACTIVE_BASE
+        interactives = collections.OrderedDict(INTERACTIVE_BASE)
         plotting_func = eval('plot_ndarray_' + mode)
         interactives.update(eval('gen_interactives_' + mode + '(arr)'))
         title = MODES[mode]
@@ -103,6 +146,23 @@ def plot_selector(
     return plotting_func, interactives, title
 
 
+# ======================================================================
+def prepare_selector(plotting_func):
+    """
+    Select the data preparation function of a plotting function.
+
+    Args:
+        plotting_func (callable): The plotting function.
+            This is obtained from `numex.gui_tk_mpl.plot_selector()`.
+
+    Returns:
+        prepare_func (callable|None): The data preparation function.
+            If None, the plotting function takes care of the data.
+    """
+    name = plotting_func.__name__.replace('plot_', 'prepare_', 1)
+    return globals().get(name)
+
+
 # ======================================================================
 def gen_interactives_1d(arr):
     interactives = collections.OrderedDict(
@@ -115,14 +175,16 @@ def gen_interactives_1d(arr):
             start=0, stop=d - 1, step=1)) for i, d in enumerate(arr.shape)]
         +
         [('line-color', dict(
-            label='Line Color', default='black', values=COLORS)),
+            label='Line Color', default='black', values=_table('COLORS'))),
          # ('rgb-color', dict(label='Line Color', default='blue', values='')),
          ('line-width', dict(
              label='Line Width', default=1., start=0., stop=9.5, step=0.5)),
          ('line-style', dict(
-             label='Line Style', default='-', values=LINESTYLES)),
+             label='Line Style', default='-',
+             values=_table('LINESTYLES'))),
          ('line-marker', dict(
-             label='Line Marker', default='.', values=LINEMARKERS)),
+             label='Line Marker', default='.',
+             values=_table('LINEMARKERS'))),
          ('marker-size', dict(
              label='Marker Size', default=5., start=0., stop=49.5, step=1.)),
          ]
@@ -144,14 +206,16 @@ def gen_interactives_2d_plot_xy(arr):
          for i, d in enumerate(arr.shape) for x in ('x', 'y')]
         +
         [('line-color', dict(
-            label='Line Color', default='black', values=COLORS)),
+            label='Line Color', default='black', values=_table('COLORS'))),
          # ('rgb-color', dict(label='Line Color', default='blue', values='')),
          ('line-width', dict(
              label='Line Width', default=1., start=0., stop=9.5, step=0.5)),
          ('line-style', dict(
-             label='Line Style', default='-', values=LINESTYLES)),
+             label='Line Style', default='-',
+             values=_table('LINESTYLES'))),
          ('line-marker', dict(
-             label='Line Marker', default='.', values=LINEMARKERS)),
+             label='Line Marker', default='.',
+             values=_table('LINEMARKERS'))),
          ('marker-size', dict(
              label='Marker Size', default=5., start=0., stop=49.5, step=1.)),
          ]
@@ -174,39 +238,121 @@ def gen_interactives_2d_map(arr):
         +
         [('cmap-{}'.format(i), dict(
             label='Color Map {}'.format(x.upper()),
-            default='gray', values=COLORMAPS))
+            default='gray', values=_table('COLORMAPS')))
          for i, x in enumerate(('a', 'b'))]
+        +
+        [('contrast', dict(
+            label='Contrast Window', default='min-max',
+            values=('min-max', 'global', 'slice'))),
+         ('contrast-percentile', dict(
+             label='Contrast Percentile', default=1.,
+             start=0., stop=10., step=0.5)),
+         ('fast-render', dict(
+            label='Fast Rendering (Color LUT)', default=True)),
+         ('roi', dict(
+             label='ROI', default='none', values=('none',) + numex.roi.KINDS)),
+         ('roi-axis', dict(
+             label='ROI Curve Axis (-1: None)', default=-1,
+             start=-1, stop=len(arr.shape) - 1, step=1))]
     )
     return interactives
 
 
+# ======================================================================
+def _line_kws(params):
+    return dict(
+        color=params['line-color'], linewidth=params['line-width'],
+        linestyle=params['line-style'], marker=params['line-marker'],
+        markersize=params['marker-size'])
+
+
+# ======================================================================
+def _decimate_line(line, x_arr, y_arr, x_lim=None):
+    if x_lim is None and not line.axes.get_autoscalex_on():
+        x_lim = line.axes.get_xlim()
+    # : at least one bin per pixel of the axes
+    n_bins = max(line.axes.get_window_extent().width, DECIMATION_BINS)
+    line.set_data(
+        *numex.display.minmax_decimate(x_arr, y_arr, n_bins, x_lim))
+
+
+# ======================================================================
+def _in_memory(arr):
+    # : memory-mapped or lazily-loaded arrays may be slow to read
+    return isinstance(arr, np.ndarray) and not isinstance(arr, np.memmap)
+
+
+# ======================================================================
+def prepare_ndarray_1d(
+        arr=None,
+        params=None,
+        preview=False,
+        **_kws):
+    """
+    Prepare the data for `plot_ndarray_1d()`.
+
+    This reads the data and performs all the computations not requiring
+    the figure, and hence can be run outside of the GUI thread.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        params (dict): The parameters of the plot.
+        preview (bool): Prepare a subsampled preview of the data.
+            This has at most `PREVIEW_SAMPLES` samples, and it is only
+            prepared for memory-mapped or lazily-loaded arrays.
+        **_kws: Ignored.
+
+    Returns:
+        result (tuple|None): The tuple
+            contains:
+             - x_arr (np.ndarray): The x-axis data.
+             - y_arrs (tuple[np.ndarray]): The y-axis data for each part.
+            If a preview is requested but not needed, None is returned.
+    """
+    size = arr.shape[params['axis']]
+    if not preview:
+        step = 1
+    elif size > PREVIEW_SAMPLES and not _in_memory(arr):
+        step = -(-size // PREVIEW_SAMPLES)
+    else:
+        return None
+    mask = [v for k, v in params.items() if k.startswith('index-')]
+    mask[params['axis']] = slice(None, None, step)
+    y_arr = np.array(arr[tuple(mask)])
+    x_arr = np.arange(0, size, step)
+    if not np.iscomplexobj(y_arr):
+        y_arrs = (y_arr,)
+    elif params['cx_mode'] == 'mag-phase':
+        y_arrs = (np.abs(y_arr), np.arctan2(y_arr.real, y_arr.imag))
+    else:
+        y_arrs = (y_arr.real, y_arr.imag)
+    return x_arr, y_arrs
+
+
 # ======================================================================
 def plot_ndarray_1d(
         fig,
         arr=None,
         params=None,
         plt_title='',
-        plt_interactives=None):
+        plt_interactives=None,
+        data=None,
+        state=None):
     try:
-        mask = [v for k, v in params.items() if k.startswith('index-')]
-        mask[params['axis']] = slice(None)
-        y_arr = arr[tuple(mask)]
-        x_arr = np.arange(len(y_arr))
-        if not np.iscomplexobj(y_arr):
-            ax = fig.gca()
-            ax.plot(
-                x_arr, y_arr,
-                color=params['line-color'], linewidth=params['line-width'],
-                linestyle=params['line-style'], marker=params['line-marker'],
-                markersize=params['marker-size'])
-            ax.set_xlabel('Index of Axis {}'.format(params['axis']))
-            ax.set_ylabel('Values / arb.units')
+        if data is None:
+            data = prepare_ndarray_1d(arr, params)
+        x_arr, y_arrs = data
+        is_complex = len(y_arrs) > 1
+        layout = (
+            params['axis'], is_complex, params['cx_mode'],
+            params['display_orientation'])
+        if not is_complex:
+            data_lims = (None,)
         else:
             if params['display_orientation'] == 'horizontal':
                 rows_cols = (1, 2)
             else:  # if params['display_orientation'] in ('vertical', 'auto'):
                 rows_cols = (2, 1)
-            y_arrs = (y_arr.real, y_arr.imag)
             titles = ('Real Part', 'Imaginary Part')
             # data_lim = (
             #     min(np.min(x) for x in y_arrs),
@@ -214,27 +360,48 @@ def plot_ndarray_1d(
             share_y = True
             data_lims = (None, None)
             if params['cx_mode'] == 'mag-phase':
-                y_arrs = (np.abs(y_arr), np.arctan2(y_arr.real, y_arr.imag))
                 titles = ('Magnitude', 'Phase')
                 data_lims = (None, (-np.pi * 1.1, np.pi * 1.1))
                 share_y = False
-            axs = fig.subplots(
-                nrows=rows_cols[0], ncols=rows_cols[1], sharey=share_y)
-
-            for i, infos in enumerate(zip(axs, y_arrs, titles, data_lims)):
-                ax, y_arr_, title, data_lim = infos
-                ax.plot(
-                    x_arr, y_arr_,
-                    color=params['line-color'],
-                    linewidth=params['line-width'],
-                    linestyle=params['line-style'],
-                    marker=params['line-marker'],
-                    markersize=params['marker-size'])
+
+        if state is not None and state['layout'] == layout:
+            # : update the existing artists
+            for i, (line, y_arr_) in enumerate(zip(state['lines'], y_arrs)):
+                state['data'][i] = x_arr, y_arr_
+                _decimate_line(line, x_arr, y_arr_)
+                line.set(**_line_kws(params))
+                line.axes.relim()
+                line.axes.autoscale_view()
+            state['blit'] = None
+        else:
+            fig.clear()
+            if not is_complex:
+                axs = (fig.gca(),)
+            else:
+                axs = fig.subplots(
+                    nrows=rows_cols[0], ncols=rows_cols[1], sharey=share_y)
+            lines = []
+            data = []
+            for i, infos in enumerate(zip(axs, y_arrs, data_lims)):
+                ax, y_arr_, data_lim = infos
+                line, = ax.plot([], [], **_line_kws(params))
+                _decimate_line(line, x_arr, y_arr_)
+                ax.relim()
+                ax.autoscale_view()
                 if data_lim:
                     ax.set_ylim(data_lim)
                 ax.set_xlabel('Index of Axis {}'.format(params['axis']))
                 ax.set_ylabel('Values / arb.units')
+                # : only the visible part is decimated when zooming
+                ax.callbacks.connect(
+                    'xlim_changed',
+                    lambda ax_, line=line, i=i: _decimate_line(
+                        line, *data[i], x_lim=ax_.get_xlim()))
+                lines.append(line)
+                data.append((x_arr, y_arr_))
+            state = dict(layout=layout, lines=lines, data=data, blit=None)
     except Exception as e:
+        state = None
         fig.clf()
         ax = fig.subplots(1)
         ax.axis('off')
@@ -248,6 +415,132 @@ def plot_ndarray_1d(
     finally:
         # fig.tight_layout()
         fig.suptitle(plt_title)
+    return state
+
+
+# ======================================================================
+def _density_cmap(color):
+    import matplotlib.colors
+
+    return matplotlib.colors.LinearSegmentedColormap.from_list(
+        'density', [
+            matplotlib.colors.to_rgba(color, 0.0),
+            matplotlib.colors.to_rgba(color, 1.0)])
+
+
+# ======================================================================
+def _add_render_hook(ax, func):
+    import matplotlib.artist
+
+    class _RenderHook(matplotlib.artist.Artist):
+        # : drawn before the other artists, once the limits are final
+        zorder = -np.inf
+
+        def draw(self, renderer):
+            func()
+
+    return ax.add_artist(_RenderHook())
+
+
+# ======================================================================
+def _render_xy(part):
+    line, image = part['line'], part['image']
+    ax = line.axes
+    x_arr, y_arr = part['data']
+    x_lim, y_lim = ax.get_xlim(), ax.get_ylim()
+    bbox = ax.get_window_extent()
+    key = (part['data'], x_lim, y_lim, bbox.size.tolist(), line.get_color())
+    # : skip when nothing changed since the last rendering
+    rendered = part['rendered']
+    if rendered and rendered[0] is key[0] and rendered[1:] == key[1:]:
+        return
+    part['rendered'] = key
+    n_inside = 0
+    if len(x_arr) > DENSITY_POINTS:
+        shape = (
+            max(int(bbox.height), DENSITY_BINS),
+            max(int(bbox.width), DENSITY_BINS))
+        hist = numex.display.density(x_arr, y_arr, shape, x_lim, y_lim)
+        n_inside = int(np.sum(hist))
+    if n_inside > DENSITY_POINTS:
+        hist = np.log1p(hist)
+        image.set_data(hist)
+        image.set_extent(tuple(sorted(x_lim)) + tuple(sorted(y_lim)))
+        image.set_clim(0, np.max(hist) or 1)
+        image.set_cmap(_density_cmap(line.get_color()))
+        line.set_data([], [])
+    else:
+        x_arr_, y_arr_, n_inside = numex.display.clip_xy(
+            x_arr, y_arr, x_lim, y_lim)
+        line.set_data(x_arr_, y_arr_)
+    image.set_visible(n_inside > DENSITY_POINTS)
+    line.set_visible(n_inside <= DENSITY_POINTS)
+
+
+# ======================================================================
+def _autoscale_xy(part, data_lim=None):
+    ax = part['line'].axes
+    x_arr, y_arr = part['data']
+    if np.any(np.isfinite(x_arr)) and np.any(np.isfinite(y_arr)):
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim((
+            (np.nanmin(x_arr), np.nanmin(y_arr)),
+            (np.nanmax(x_arr), np.nanmax(y_arr))))
+        ax.autoscale_view()
+    if data_lim:
+        ax.set_xlim(data_lim)
+        ax.set_ylim(data_lim)
+
+
+# ======================================================================
+def prepare_ndarray_2d_plot_xy(
+        arr=None,
+        params=None,
+        preview=False,
+        **_kws):
+    """
+    Prepare the data for `plot_ndarray_2d_plot_xy()`.
+
+    This reads the data and performs all the computations not requiring
+    the figure, and hence can be run outside of the GUI thread.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        params (dict): The parameters of the plot.
+        preview (bool): Prepare a preview of the data.
+            This is not supported and None is returned.
+        **_kws: Ignored.
+
+    Returns:
+        result (tuple|None): The tuple
+            contains:
+             - xy_arrs (tuple[tuple[np.ndarray]]): The (x, y) data pairs
+               for each part.
+             - labels (tuple[str]): The x-axis and y-axis labels.
+    """
+    if preview:
+        return None
+    x_mask = [v for k, v in params.items() if k.startswith('x-index-')]
+    x_mask[params['axis']] = slice(None)
+    y_mask = [v for k, v in params.items() if k.startswith('y-index-')]
+    y_mask[params['axis']] = slice(None)
+    y_arr = np.array(arr[tuple(x_mask)])
+    x_arr = np.array(arr[tuple(y_mask)])
+    labels = (
+        'Values @ {} / arb.units'.format(
+            [x if isinstance(x, int) else np.nan for x in x_mask]),
+        'Values @ {} / arb.units'.format(
+            [x if isinstance(x, int) else np.nan for x in y_mask]))
+    if not np.iscomplexobj(x_arr) and not np.iscomplexobj(y_arr):
+        xy_arrs = ((x_arr, y_arr),)
+    elif params['cx_mode'] == 'mag-phase':
+        xy_arrs = (
+            (np.abs(x_arr), np.abs(y_arr)),
+            (np.arctan2(x_arr.real, x_arr.imag),
+             np.arctan2(y_arr.real, y_arr.imag)))
+    else:
+        xy_arrs = ((x_arr.real, y_arr.real), (x_arr.imag, y_arr.imag))
+    return xy_arrs, labels
 
 
 # ======================================================================
@@ -256,31 +549,24 @@ def plot_ndarray_2d_plot_xy(
         arr=None,
         params=None,
         plt_title='',
-        plt_interactives=None):
+        plt_interactives=None,
+        data=None,
+        state=None):
     try:
-        x_mask = [v for k, v in params.items() if k.startswith('x-index-')]
-        x_mask[params['axis']] = slice(None)
-        y_mask = [v for k, v in params.items() if k.startswith('y-index-')]
-        y_mask[params['axis']] = slice(None)
-        y_arr = arr[tuple(x_mask)]
-        x_arr = arr[tuple(y_mask)]
-        if not np.iscomplexobj(x_arr) and not np.iscomplexobj(y_arr):
-            ax = fig.gca()
-            ax.plot(
-                x_arr, y_arr,
-                color=params['line-color'], linewidth=params['line-width'],
-                linestyle=params['line-style'], marker=params['line-marker'],
-                markersize=params['marker-size'])
-            ax.set_xlabel('Values @ {} / arb.units'.format(
-                [x if isinstance(x, int) else np.nan for x in x_mask]))
-            ax.set_ylabel('Values @ {} / arb.units'.format(
-                [x if isinstance(x, int) else np.nan for x in y_mask]))
+        if data is None:
+            data = prepare_ndarray_2d_plot_xy(arr, params)
+        xy_arrs, (x_label, y_label) = data
+        is_complex = len(xy_arrs) > 1
+        layout = (
+            params['axis'], is_complex, params['cx_mode'],
+            params['display_orientation'])
+        if not is_complex:
+            data_lims = (None,)
         else:
             if params['display_orientation'] == 'horizontal':
                 rows_cols = (1, 2)
             else:  # if params['display_orientation'] in ('vertical', 'auto'):
                 rows_cols = (2, 1)
-            xy_arrs = ((x_arr.real, y_arr.real), (x_arr.imag, y_arr.imag))
             titles = ('Real Part', 'Imaginary Part')
             # data_lim = (
             #     min(np.min(x) for x in y_arrs),
@@ -288,33 +574,49 @@ def plot_ndarray_2d_plot_xy(
             share_xy = True
             data_lims = (None, None)
             if params['cx_mode'] == 'mag-phase':
-                xy_arrs = (
-                    (np.abs(x_arr), np.abs(y_arr)),
-                    (np.arctan2(x_arr.real, x_arr.imag),
-                     np.arctan2(y_arr.real, y_arr.imag)))
                 titles = ('Magnitude', 'Phase')
                 data_lims = (None, (-np.pi * 1.1, np.pi * 1.1))
                 share_xy = False
-            axs = fig.subplots(
-                nrows=rows_cols[0], ncols=rows_cols[1],
-                sharex=share_xy, sharey=share_xy)
-
-            for i, infos in enumerate(zip(axs, xy_arrs, titles, data_lims)):
-                ax, (x_arr_, y_arr_), title, data_lim = infos
-                ax.plot(
-                    x_arr_, y_arr_,
-                    color=params['line-color'], linewidth=params['line-width'],
-                    linestyle=params['line-style'],
-                    marker=params['line-marker'],
-                    markersize=params['marker-size'])
-                ax.set_xlabel('Values @ {} / arb.units'.format(
-                    [x if isinstance(x, int) else np.nan for x in x_mask]))
-                ax.set_ylabel('Values @ {} / arb.units'.format(
-                    [x if isinstance(x, int) else np.nan for x in y_mask]))
-                if data_lim:
-                    ax.set_xlim(data_lim)
-                    ax.set_ylim(data_lim)
+
+        if state is not None and state['layout'] == layout:
+            # : update the existing artists
+            for part, xy_arr, data_lim in zip(
+                    state['parts'], xy_arrs, data_lims):
+                part['data'] = xy_arr
+                part['line'].set(**_line_kws(params))
+                part['line'].axes.set_xlabel(x_label)
+                part['line'].axes.set_ylabel(y_label)
+                if part['line'].axes.get_autoscale_on():
+                    _autoscale_xy(part, data_lim)
+            state['blit'] = None
+        else:
+            fig.clear()
+            if not is_complex:
+                axs = (fig.gca(),)
+            else:
+                axs = fig.subplots(
+                    nrows=rows_cols[0], ncols=rows_cols[1],
+                    sharex=share_xy, sharey=share_xy)
+            parts = []
+            for i, infos in enumerate(zip(axs, xy_arrs, data_lims)):
+                ax, xy_arr, data_lim = infos
+                line, = ax.plot([], [], **_line_kws(params))
+                # : dense points are shown as a density image instead
+                image = ax.imshow(
+                    np.zeros((1, 1)), origin='lower', aspect='auto',
+                    interpolation='nearest', visible=False)
+                part = dict(
+                    line=line, image=image, data=xy_arr, rendered=None)
+                ax.set_xlabel(x_label)
+                ax.set_ylabel(y_label)
+                _autoscale_xy(part, data_lim)
+                # : render on drawing, i.e. once per change of the
+                #   (possibly shared) limits, rather than on every change
+                _add_render_hook(ax, lambda part=part: _render_xy(part))
+                parts.append(part)
+            state = dict(layout=layout, parts=parts, blit=None)
     except Exception as e:
+        state = None
         fig.clf()
         ax = fig.subplots(1)
         ax.axis('off')
@@ -328,6 +630,391 @@ def plot_ndarray_2d_plot_xy(
     finally:
         # fig.tight_layout()
         fig.suptitle(plt_title)
+    return state
+
+
+# ======================================================================
+def _slices(arr):
+    return dict(
+        cache=LRUCache(SLICE_CACHE_SIZE), last_key=None, ortho_keys=None)
+
+
+# ======================================================================
+def _slice_2d_map(key, arr, step=1):
+    (axis_0, axis_1), indices, cx_mode = key
+    mask = list(indices)
+    mask[axis_0] = slice(None, None, step)
+    mask[axis_1] = slice(None, None, step)
+    img = arr[tuple(mask)]
+    if axis_1 > axis_0:
+        img = img.T
+    if not np.iscomplexobj(img):
+        return img.astype(float),
+    else:
+        img = np.array(img)
+        if cx_mode == 'mag-phase':
+            return np.abs(img), np.arctan2(img.real, img.imag)
+        else:
+            return img.real, img.imag
+
+
+# ======================================================================
+def _neighbors(key, last_key, shape):
+    axes, indices, cx_mode = key
+    if last_key is not None and last_key[0] == axes:
+        moved = [
+            i for i, (index, last_index) in enumerate(
+                zip(indices, last_key[1])) if index != last_index]
+    else:
+        moved = []
+    if not moved:
+        moved = [i for i, index in enumerate(indices) if index is not None]
+    keys = []
+    for i in moved:
+        for step in (1, -1):
+            if 0 <= indices[i] + step < shape[i]:
+                indices_ = list(indices)
+                indices_[i] += step
+                keys.append((axes, tuple(indices_), cx_mode))
+    return keys
+
+
+# ======================================================================
+def _pyramids(key, imgs):
+    return tuple(numex.display.pyramid(img) for img in imgs)
+
+
+# ======================================================================
+def _set_image(part, img):
+    if part['lut'] is None:
+        part['pax'].set_data(img)
+    else:
+        # : the RGBA buffer is reused (if the shape is unchanged)
+        part['rgba'] = numex.display.apply_lut(
+            img, part['mappable'].get_clim(), *part['lut'],
+            out=part['rgba'])
+        part['pax'].set_data(part['rgba'])
+
+
+# ======================================================================
+def _render_map(part):
+    # : the limits may change while rendering (e.g. by updating the extent)
+    if part['guard']['busy']:
+        return
+    part['guard']['busy'] = True
+    try:
+        pax, levels = part['pax'], part['levels']
+        if levels is None:
+            return
+        ax = pax.axes
+        x_lim, y_lim = ax.get_xlim(), ax.get_ylim()
+        bbox = ax.get_window_extent()
+        level = numex.display.pyramid_level(
+            (abs(y_lim[1] - y_lim[0]), abs(x_lim[1] - x_lim[0])),
+            (bbox.height, bbox.width), len(levels) - 1)
+        region, extent = numex.display.pyramid_region(
+            levels[level], level, x_lim, y_lim)
+        _set_image(part, region)
+        pax.set_extent(extent)
+    finally:
+        part['guard']['busy'] = False
+
+
+# ======================================================================
+def _contrast_percentiles(params):
+    if params.get('contrast', 'min-max') == 'min-max':
+        return None
+    percentile = params['contrast-percentile']
+    return percentile, 100 - percentile
+
+
+# ======================================================================
+def _slice_limits(key, imgs):
+    name, (axes, indices, cx_mode), percentiles = key
+    if cx_mode == 'real-imag':
+        # : the real and imaginary parts share the limits
+        values = np.concatenate([
+            numex.stats.sample(img_, numex.stats.SAMPLE_SIZE // 2)
+            for img_ in imgs])
+        values.sort()
+        data_lim = numex.stats.sample_percentiles(values, percentiles)
+        return data_lim, data_lim
+    values = numex.stats.sample(imgs[0])
+    values.sort()
+    data_lims = numex.stats.sample_percentiles(values, percentiles),
+    if cx_mode == 'mag-phase':
+        data_lims += (-np.pi, np.pi),
+    return data_lims
+
+
+# ======================================================================
+def prepare_ndarray_2d_map(
+        arr=None,
+        params=None,
+        plt_interactives=None,
+        preview=False,
+        progress=None,
+        **_kws):
+    """
+    Prepare the data for `plot_ndarray_2d_map()`.
+
+    This reads the data and performs all the computations not requiring
+    the figure, and hence can be run outside of the GUI thread.
+
+    The prepared slices are kept in a cache (of at most `SLICE_CACHE_SIZE`
+    bytes per array) and the slices next to the displayed one, along the
+    axes whose index changed last, are prepared in advance in background
+    threads, so that moving through the array does not wait for the data.
+
+    For slices larger than `PYRAMID_PIXELS`, the coarser levels of their
+    multi-resolution pyramid (see `numex.display.pyramid()`) are also
+    computed and cached.
+
+    The contrast window is either the data range, or a percentile range
+    of the whole array ('global') or of the displayed slice ('slice'),
+    estimated from a sample of the values (see `numex.stats.sample()`),
+    so that a few outliers do not wash out the images.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        params (dict): The parameters of the plot.
+        plt_interactives (dict): The interactive parameters information.
+        preview (bool): Prepare a subsampled preview of the data.
+            This has at most `PREVIEW_PIXELS` pixels, and it is only
+            prepared if the slice is not cached.
+            If the data limits of the array are not computed yet, the
+            limits of the preview are used instead.
+        progress (callable|None): Report the progress of the sampling
+            of the array for the global percentiles.
+            See `numex.stats.sample()` for more info.
+        **_kws: Ignored.
+
+    Returns:
+        result (tuple|None): The tuple
+            contains:
+             - imgs (tuple[np.ndarray]): The images for each part.
+             - data_lims (tuple[tuple[float]]): The limits for each part.
+             - pyramids (tuple[tuple[np.ndarray]]|None): The coarser
+               pyramid levels for each part, if the slice is large enough.
+             - step (int): The subsampling step of the images.
+            If a preview is requested but not needed, None is returned.
+
+    Raises:
+        ValueError: If the two axes to display are the same.
+    """
+    if params['axis-0'] == params['axis-1']:
+        text = '`{}` and `{}` must be different!'.format(
+            plt_interactives['axis-0']['label'],
+            plt_interactives['axis-1']['label'])
+        raise ValueError(text)
+    axes = params['axis-0'], params['axis-1']
+    indices = tuple(
+        None if i in axes else v for i, v in enumerate(
+            v for k, v in params.items() if k.startswith('index-')))
+    is_complex = np.iscomplexobj(arr)
+    cx_mode = params['cx_mode'] if is_complex else None
+    key = axes, indices, cx_mode
+    slices = numex.stats.cached(arr, 'slices', _slices)
+    contrast = params.get('contrast', 'min-max')
+    percentiles = _contrast_percentiles(params)
+    if preview:
+        size = arr.shape[axes[0]] * arr.shape[axes[1]]
+        if key in slices['cache'] or size <= PREVIEW_PIXELS:
+            return None
+        step = int(np.ceil(np.sqrt(size / PREVIEW_PIXELS)))
+        imgs = _slice_2d_map(key, arr, step)
+        if contrast == 'slice' or numex.stats.peek(
+                arr, 'samples' if contrast == 'global' else 'extrema') \
+                is None:
+            # : the preview is small enough to be sampled entirely
+            data_lims = _slice_limits(
+                ('limits', key, percentiles or (0, 100)), imgs)
+        else:
+            data_lims = numex.stats.data_limits(
+                arr, params['cx_mode'], percentiles)
+        return imgs, data_lims, None, step
+    imgs = slices['cache'].compute(key, _slice_2d_map, arr)
+    slices['cache'].prefetch(
+        _neighbors(key, slices['last_key'], arr.shape), _slice_2d_map, arr)
+    slices['last_key'] = key
+    if contrast == 'slice':
+        data_lims = slices['cache'].compute(
+            ('limits', key, percentiles), _slice_limits, imgs)
+        if any(None in data_lim for data_lim in data_lims):
+            # : e.g. slices without finite values
+            data_lims = numex.stats.data_limits(
+                arr, params['cx_mode'], percentiles, progress)
+    else:
+        data_lims = numex.stats.data_limits(
+            arr, params['cx_mode'], percentiles, progress)
+    if imgs[0].size > PYRAMID_PIXELS:
+        pyramids = slices['cache'].compute(('pyramid', key), _pyramids, imgs)
+    else:
+        pyramids = None
+    return imgs, data_lims, pyramids, 1
+
+
+# ======================================================================
+def _roi_curve(key, arr):
+    (axis_0, axis_1), indices, cx_mode, curve_axis, roi = key
+    (rows, cols), mask = numex.roi.mask(*roi)
+    index = list(indices)
+    index[axis_0], index[axis_1], index[curve_axis] = \
+        cols, rows, slice(None)
+    block = arr[tuple(index)]
+    # : the remaining axes are sorted as (curve, rows, columns)
+    axes = sorted((axis_0, axis_1, curve_axis))
+    block = np.moveaxis(
+        block, [axes.index(axis) for axis in (curve_axis, axis_1, axis_0)],
+        (0, 1, 2))
+    # : the masked values of all the slices are gathered chunk by chunk
+    #   and reduced at once, without iterating over the slices
+    step = max(
+        1, numex.stats.CHUNK_SIZE
+        // max(1, mask.size * block.dtype.itemsize))
+    values = np.concatenate([
+        np.asarray(block[i:i + step])[:, mask]
+        for i in range(0, block.shape[0], step)])
+    if not np.iscomplexobj(values):
+        parts = values,
+    elif cx_mode == 'mag-phase':
+        parts = np.abs(values), np.arctan2(values.real, values.imag)
+    else:
+        parts = values.real, values.imag
+    return tuple(numex.roi.statistics(part) for part in parts)
+
+
+# ======================================================================
+def _roi_text(stats):
+    names = [
+        ('N', 'count'), ('Mean', 'mean'), ('Std', 'std'),
+        ('Min', 'min'), ('Max', 'max')] + [
+        ('P{}'.format(q), 'p{}'.format(q)) for q in numex.roi.PERCENTILES]
+    return '\n'.join(
+        '{:<5s}{:.4g}'.format(label, float(stats[name]))
+        for label, name in names)
+
+
+# ======================================================================
+def _update_roi(state):
+    context = state['roi_context']
+    imgs, step = context['imgs'], context['step']
+    roi = state['roi']
+    if step != 1:
+        # : the statistics are not computed on the preview
+        return
+    parts = state['parts']
+    for part, img_ in zip(parts, imgs):
+        if roi is None:
+            part['roi_text'].set_text('')
+            part['roi_text'].set_visible(False)
+        else:
+            index, mask = numex.roi.mask(*roi)
+            part['roi_text'].set_text(
+                _roi_text(numex.roi.statistics(img_[index][mask])))
+            part['roi_text'].set_visible(True)
+    if 'roi_line' not in parts[0]:
+        return
+    arr, params, curve_axis = \
+        context['arr'], context['params'], context['curve_axis']
+    for part in parts:
+        part['roi_cursor'].set_xdata(
+            [params['index-{}'.format(curve_axis)]] * 2)
+    state['roi_key'] = None
+    if roi is None or not numex.roi.mask(*roi)[1].any():
+        # : e.g. ROIs without any pixel center
+        for part in parts:
+            part['roi_line'].set_data([], [])
+        return
+    axes = params['axis-0'], params['axis-1']
+    indices = tuple(
+        None if i in axes or i == curve_axis else v for i, v in enumerate(
+            v for k, v in params.items() if k.startswith('index-')))
+    cx_mode = params['cx_mode'] if np.iscomplexobj(arr) else None
+    key = axes, indices, cx_mode, curve_axis, roi
+    state['roi_key'] = key
+    slices = numex.stats.cached(arr, 'slices', _slices)
+    curves = slices['cache'].get(key)
+    if curves is None:
+        # : the curve reads the ROI across the whole curve axis, and hence
+        #   it is computed in background and drawn when ready
+        for part in parts:
+            part['roi_line'].set_data([], [])
+        slices['cache'].prefetch([key], _roi_curve, arr)
+        _poll_roi_curve(state, slices['cache'], key)
+        return
+    for part, stats in zip(parts, curves):
+        line = part['roi_line']
+        line.set_data(np.arange(len(stats['mean'])), stats['mean'])
+        line.axes.relim()
+        line.axes.autoscale_view()
+
+
+# ======================================================================
+def _poll_roi_curve(state, cache, key):
+    _stop_roi_poll(state)
+    canvas = state['parts'][0]['pax'].axes.figure.canvas
+
+    def poll():
+        if state['roi_key'] != key:
+            return False
+        # : the pending state is checked first, as the item is cached
+        #   before it stops being pending
+        pending = cache.is_pending(key)
+        if key in cache:
+            _update_roi(state)
+            canvas.draw_idle()
+            return False
+        # : stop polling if the computation failed
+        return pending
+
+    timer = canvas.new_timer(interval=ROI_POLL_INTERVAL)
+    timer.add_callback(poll)
+    timer.start()
+    state['roi_timer'] = timer
+
+
+# ======================================================================
+def _stop_roi_poll(state):
+    if state.get('roi_timer') is not None:
+        state['roi_timer'].stop()
+        state['roi_timer'] = None
+
+
+# ======================================================================
+def _make_roi_selector(state, kind, shape, last_roi=None):
+    import matplotlib.widgets
+
+    ax = state['parts'][0]['pax'].axes
+
+    def onselect(*_args):
+        selector = state['roi_selector']
+        if kind == 'polygon':
+            geometry = tuple(
+                (float(x), float(y)) for x, y in selector.verts)
+        else:
+            geometry = tuple(float(x) for x in selector.extents)
+        state['roi'] = shape, kind, geometry
+        _update_roi(state)
+        ax.figure.canvas.draw_idle()
+
+    if kind == 'polygon':
+        selector = matplotlib.widgets.PolygonSelector(ax, onselect)
+    elif kind == 'ellipse':
+        selector = matplotlib.widgets.EllipseSelector(
+            ax, onselect, interactive=True)
+    else:  # if kind == 'rectangle':
+        selector = matplotlib.widgets.RectangleSelector(
+            ax, onselect, interactive=True)
+    state['roi_selector'] = selector
+    state['roi'] = None
+    if last_roi is not None and last_roi[:2] == (shape, kind):
+        # : the last ROI is kept when the plot is created again
+        if kind == 'polygon':
+            selector.verts = list(last_roi[2])
+        else:
+            selector.extents = last_roi[2]
+        state['roi'] = last_roi
 
 
 # ======================================================================
@@ -336,68 +1023,174 @@ def plot_ndarray_2d_map(
         arr=None,
         params=None,
         plt_title='',
-        plt_interactives=None):
+        plt_interactives=None,
+        data=None,
+        state=None):
+    from mpl_toolkits.axes_grid1 import make_axes_locatable
     try:
-        mask = [v for k, v in params.items() if k.startswith('index-')]
-        mask[params['axis-0']] = slice(None)
-        mask[params['axis-1']] = slice(None)
-        if params['axis-0'] == params['axis-1']:
-            text = '`{}` and `{}` must be different!'.format(
-                plt_interactives['axis-0']['label'],
-                plt_interactives['axis-1']['label'])
-            raise ValueError(text)
-        img = arr[tuple(mask)]
-        if params['axis-1'] > params['axis-0']:
-            img = img.T
-
-        if not np.iscomplexobj(img):
-            img = img.astype(float)
-            data_lim = (np.min(arr), np.max(arr))
-            ax = fig.gca()
-            pax = ax.imshow(
-                img, vmin=data_lim[0], vmax=data_lim[1],
-                cmap=params['cmap-0'], origin='bottom')
-            divider = make_axes_locatable(ax)
-            cax = divider.append_axes('right', size='5%', pad=0.05)
-            cbar = ax.figure.colorbar(pax, cax=cax)
-            cbar.ax.get_yaxis().labelpad = 15
-            cbar.ax.set_ylabel('Values / arb.units', rotation=-90)
-            ax.set_xlabel('Index of Axis {}'.format(params['axis-0']))
-            ax.set_ylabel('Index of Axis {}'.format(params['axis-1']))
-            # ax.set_title()
+        if data is None:
+            data = prepare_ndarray_2d_map(arr, params, plt_interactives)
+        imgs, data_lims, pyramids, step = data
+        # : the shape of the (full resolution) slice
+        shape = arr.shape[params['axis-1']], arr.shape[params['axis-0']]
+        use_pyramid = shape[0] * shape[1] > PYRAMID_PIXELS
+        full_extent = (-0.5, shape[1] - 0.5, -0.5, shape[0] - 0.5)
+        extent = (
+            -0.5, imgs[0].shape[1] * step - 0.5,
+            -0.5, imgs[0].shape[0] * step - 0.5)
+        if len(imgs) == 1:
+            rows_cols = None
+            titles = (None,)
         else:
             if params['display_orientation'] == 'horizontal':
                 rows_cols = (1, 2)
             elif params['display_orientation'] == 'vertical':
                 rows_cols = (2, 1)
             else:  # if params['display_orientation'] == 'auto':
-                rows_cols = (2, 1) if img.shape[0] < img.shape[1] else (1, 2)
-            axs = fig.subplots(nrows=rows_cols[0], ncols=rows_cols[1])
-            imgs = (img.real, img.imag)
+                rows_cols = (2, 1) if shape[0] < shape[1] else (1, 2)
             titles = ('Real Part', 'Imaginary Part')
-            data_lim = (
-                min(np.min(arr.real), np.min(arr.imag)),
-                max(np.max(arr.real), np.max(arr.imag)))
-            data_lims = (data_lim, data_lim)
             if params['cx_mode'] == 'mag-phase':
-                imgs = (np.abs(img), np.arctan2(img.real, img.imag))
                 titles = ('Magnitude', 'Phase')
-                data_lims = ((0, np.max(np.abs(arr))), (-np.pi, np.pi))
+        cmaps = tuple(params['cmap-{}'.format(i)] for i in range(len(imgs)))
+        roi_kind = params.get('roi', 'none')
+        curve_axis = params.get('roi-axis', -1)
+        if roi_kind == 'none' or curve_axis < 0 \
+                or curve_axis in (params['axis-0'], params['axis-1']):
+            curve_axis = None
+        layout = (
+            params['axis-0'], params['axis-1'], shape, rows_cols,
+            params['cx_mode'] if rows_cols else None, params['fast-render'],
+            roi_kind, curve_axis)
+        roi_context = dict(
+            arr=arr, params=params, imgs=imgs, step=step,
+            curve_axis=curve_axis)
 
-            for i, infos in enumerate(zip(axs, imgs, titles, data_lims)):
-                ax, img_, title, data_lim = infos
-                pax = ax.imshow(
-                    img_, vmin=data_lim[0], vmax=data_lim[1],
-                    cmap=params['cmap-{}'.format(i)], origin='bottom')
+        if state is not None and state['layout'] == layout:
+            # : update the existing artists
+            state['blit'] = []
+            for i, (part, img_, data_lim, cmap) in enumerate(
+                    zip(state['parts'], imgs, data_lims, cmaps)):
+                pax, mappable = part['pax'], part['mappable']
+                changed = False
+                if tuple(mappable.get_clim()) != tuple(data_lim):
+                    mappable.set_clim(data_lim)
+                    changed = True
+                if mappable.get_cmap().name != cmap:
+                    mappable.set_cmap(cmap)
+                    if part['lut'] is not None:
+                        part['lut'] = numex.display.colormap_lut(cmap)
+                    changed = True
+                same_extent = tuple(pax.get_extent()) == extent
+                if pyramids is not None:
+                    part['levels'] = (img_,) + pyramids[i]
+                    _render_map(part)
+                else:
+                    if use_pyramid:
+                        # : the preview is shown until the levels are ready
+                        part['levels'] = None
+                    _set_image(part, img_)
+                    if not same_extent:
+                        pax.set_extent(extent)
+                # : opaque images of unchanged extent can be blitted
+                if not changed and same_extent and pyramids is None \
+                        and np.all(np.isfinite(img_)):
+                    state['blit'].append(pax)
+            if len(state['blit']) < len(state['parts']):
+                state['blit'] = None
+            if roi_kind != 'none':
+                # : the ROI statistics change with the images
+                state['roi_context'] = roi_context
+                _update_roi(state)
+                state['blit'] = None
+        else:
+            import matplotlib.cm
+            import matplotlib.colors
+
+            last_roi = None
+            if state is not None and state.get('roi_selector') is not None:
+                state['roi_selector'].disconnect_events()
+                _stop_roi_poll(state)
+                last_roi = state['roi']
+            fig.clear()
+            if rows_cols is None:
+                axs = (fig.subplots(),)
+            else:
+                axs = fig.subplots(nrows=rows_cols[0], ncols=rows_cols[1])
+            parts = []
+            for i, infos in enumerate(
+                    zip(axs, imgs, titles, data_lims, cmaps)):
+                ax, img_, title, data_lim, cmap = infos
+                if use_pyramid and pyramids is not None:
+                    img_, levels = pyramids[i][-1], (img_,) + pyramids[i]
+                else:
+                    levels = None
+                if not params['fast-render']:
+                    pax = ax.imshow(
+                        img_, vmin=data_lim[0], vmax=data_lim[1],
+                        cmap=cmap, origin='lower', extent=extent)
+                    part = dict(pax=pax, mappable=pax, lut=None)
+                else:
+                    # : the colors are computed directly (see `_set_image()`)
+                    #   while the color scale is provided separately
+                    mappable = matplotlib.cm.ScalarMappable(
+                        matplotlib.colors.Normalize(*data_lim), cmap)
+                    part = dict(
+                        mappable=mappable, rgba=None,
+                        lut=numex.display.colormap_lut(cmap))
+                    part['pax'] = pax = ax.imshow(
+                        np.zeros(img_.shape + (4,), dtype=np.uint8),
+                        origin='lower', extent=extent)
+                    _set_image(part, img_)
+                part.update(guard=guard, levels=levels)
+                if use_pyramid:
+                    # : only the visible region is shown, at the pyramid
+                    #   level matching the screen resolution
+                    ax.set_xlim(full_extent[:2])
+                    ax.set_ylim(full_extent[2:])
+                    ax.set_autoscale_on(False)
+                    _render_map(part)
+                    for name in ('xlim_changed', 'ylim_changed'):
+                        ax.callbacks.connect(
+                            name, lambda ax_, part=part: _render_map(part))
                 divider = make_axes_locatable(ax)
                 cax = divider.append_axes('right', size='5%', pad=0.05)
-                cbar = ax.figure.colorbar(pax, cax=cax)
-                cbar.ax.get_yaxis().labelpad = 12
+                cbar = ax.figure.colorbar(part['mappable'], cax=cax)
+                cbar.ax.get_yaxis().labelpad = 15 if title is None else 12
                 cbar.ax.set_ylabel('Values / arb.units', rotation=-90)
                 ax.set_xlabel('Index of Axis {}'.format(params['axis-0']))
                 ax.set_ylabel('Index of Axis {}'.format(params['axis-1']))
-                ax.set_title(title)
+                if title is not None:
+                    ax.set_title(title)
+                if roi_kind != 'none':
+                    part['roi_text'] = ax.text(
+                        0.02, 0.98, '', transform=ax.transAxes,
+                        ha='left', va='top', family='monospace',
+                        fontsize='x-small', visible=False,
+                        bbox=dict(facecolor='white', alpha=0.6))
+                if curve_axis is not None:
+                    curve_ax = divider.append_axes(
+                        'bottom', size='35%', pad=0.6)
+                    part['roi_line'], = curve_ax.plot([], [], color='black')
+                    part['roi_cursor'] = curve_ax.axvline(
+                        params['index-{}'.format(curve_axis)],
+                        color='#cc3333', linewidth=0.8)
+                    curve_ax.set_xlabel(
+                        'Index of Axis {}'.format(curve_axis))
+                    curve_ax.set_ylabel('ROI Mean')
+                parts.append(part)
+            state = dict(
+                layout=layout, parts=parts, blit=None,
+                paxs=[part['pax'] for part in parts],
+                roi_context=roi_context, roi_selector=None, roi=None,
+                roi_key=None, roi_timer=None)
+            if roi_kind != 'none':
+                _make_roi_selector(state, roi_kind, shape, last_roi)
+                _update_roi(state)
     except Exception as e:
+        if state is not None and state.get('roi_selector') is not None:
+            state['roi_selector'].disconnect_events()
+            _stop_roi_poll(state)
+        state = None
         fig.clf()
         ax = fig.subplots(1)
         ax.axis('off')
@@ -411,13 +1204,734 @@ def plot_ndarray_2d_map(
     finally:
         # fig.tight_layout()
         fig.suptitle(plt_title)
+    return state
+
+
+# ======================================================================
+def gen_interactives_2d_map_profile(arr):
+    interactives = gen_interactives_2d_map(arr)
+    for name in ('roi', 'roi-axis'):
+        interactives.pop(name)
+    interactives['profile-color'] = dict(
+        label='Profile Color', default='red', values=_table('COLORS'))
+    return interactives
+
+
+# ======================================================================
+# : the profiles are sampled from the slices prepared for the 2D map
+prepare_ndarray_2d_map_profile = prepare_ndarray_2d_map
+
+
+# ======================================================================
+def _update_profiles(state):
+    plan_key = tuple(state['vertices']), state['imgs'][0].shape, state['step']
+    if state['plan_key'] != plan_key:
+        # : the sampling is only computed again when the vertices move
+        state['plan'] = numex.display.profile_plan(
+            np.array(state['vertices']) / state['step'],
+            state['imgs'][0].shape)
+        state['plan_key'] = plan_key
+    dist = state['plan']['dist'] * state['step']
+    state['profiles'] = [
+        (dist, numex.display.sample_profile(img_, state['plan'], period))
+        for img_, period in zip(state['imgs'], state['periods'])]
+    for path in state['paths']:
+        path.set_data(*zip(*state['vertices']))
+    state['profile_axs'][0].set_xlim(0, max(dist[-1], 1))
+    _decimate_profiles(state)
+
+
+# ======================================================================
+def _decimate_profiles(state):
+    x_lim = state['profile_axs'][0].get_xlim()
+    for line, (dist, profile) in zip(state['lines'], state['profiles']):
+        # : one bin per pixel of the axes, as profiles are never autoscaled
+        n_bins = line.axes.get_window_extent().width
+        line.set_data(
+            *numex.display.minmax_decimate(dist, profile, n_bins, x_lim))
+
+
+# ======================================================================
+def _on_profile_press(event, state):
+    if state['map'] is None:
+        return
+    axs = [part['pax'].axes for part in state['map']['parts']]
+    toolbar = getattr(event.canvas, 'toolbar', None)
+    if event.inaxes not in axs or (toolbar is not None and toolbar.mode):
+        return
+    points = event.inaxes.transData.transform(state['vertices'])
+    dists = np.hypot(points[:, 0] - event.x, points[:, 1] - event.y)
+    i = int(np.argmin(dists))
+    near = dists[i] <= PROFILE_PICK_RADIUS
+    if event.button == 1 and near:
+        # : while dragging, the maps are restored from a saved background
+        #   and only the profile path is drawn over them
+        state['drag'] = i
+        for path in state['paths']:
+            path.set_animated(True)
+        event.canvas.draw()
+        state['backgrounds'] = [
+            event.canvas.copy_from_bbox(ax.bbox) for ax in axs]
+    elif event.button == 3:
+        # : add a vertex at the end, or remove the picked one
+        if not near:
+            state['vertices'].append((event.xdata, event.ydata))
+        elif len(state['vertices']) > 2:
+            del state['vertices'][i]
+        _update_profiles(state)
+        event.canvas.draw_idle()
+
+
+# ======================================================================
+def _on_profile_motion(event, state):
+    if state['drag'] is None or event.inaxes is None \
+            or event.inaxes not in [path.axes for path in state['paths']]:
+        return
+    state['vertices'][state['drag']] = event.xdata, event.ydata
+    _update_profiles(state)
+    canvas = event.canvas
+    for path, background in zip(state['paths'], state['backgrounds']):
+        canvas.restore_region(background)
+        path.axes.draw_artist(path)
+        canvas.blit(path.axes.bbox)
+    state['profile_fig'].draw(canvas.get_renderer())
+    canvas.blit(state['profile_fig'].bbox)
+
+
+# ======================================================================
+def _on_profile_release(event, state):
+    if state['drag'] is None:
+        return
+    state['drag'] = None
+    state['backgrounds'] = None
+    for path in state['paths']:
+        path.set_animated(False)
+    event.canvas.draw_idle()
+
+
+# ======================================================================
+def plot_ndarray_2d_map_profile(
+        fig,
+        arr=None,
+        params=None,
+        plt_title='',
+        plt_interactives=None,
+        data=None,
+        state=None):
+    """
+    Plot a 2D map with the intensity profile along a polyline.
+
+    The vertices of the polyline can be dragged (left button) over the map,
+    and vertices are added at the end or removed (right button).
+    The profile is updated live while dragging, by sampling the images with
+    bilinear interpolation (see `numex.display.profile_plan()`), and only
+    the polyline and the profiles are redrawn.
+    """
+    try:
+        if data is None:
+            data = prepare_ndarray_2d_map_profile(
+                arr, params, plt_interactives)
+        imgs, data_lims, pyramids, step = data
+        shape = arr.shape[params['axis-1']], arr.shape[params['axis-0']]
+        cx_mode = params['cx_mode'] if len(imgs) > 1 else None
+        layout = shape, cx_mode
+
+        if state is None or state['layout'] != layout:
+            if state is not None:
+                for cid in state['cids']:
+                    fig.canvas.mpl_disconnect(cid)
+            fig.clear()
+            map_fig, profile_fig = fig.subfigures(
+                nrows=1, ncols=2, width_ratios=(3, 2))
+            profile_axs = profile_fig.subplots(
+                nrows=len(imgs), ncols=1, sharex=True, squeeze=False)[:, 0]
+            if cx_mode is None:
+                titles = (None,)
+            elif cx_mode == 'mag-phase':
+                titles = ('Magnitude', 'Phase')
+            else:
+                titles = ('Real Part', 'Imaginary Part')
+            lines = []
+            for ax, title in zip(profile_axs, titles):
+                lines.extend(ax.plot([], [], color='black'))
+                ax.set_ylabel('Values / arb.units')
+                if title is not None:
+                    ax.set_title(title)
+            profile_axs[-1].set_xlabel('Distance along Profile / px')
+            state = dict(
+                layout=layout, map_fig=map_fig, map=None,
+                profile_fig=profile_fig, profile_axs=profile_axs,
+                lines=lines, profiles=[], paths=[], drag=None,
+                backgrounds=None,
+                vertices=[(0, shape[0] // 2), (shape[1] - 1, shape[0] // 2)],
+                periods=(None, 2 * np.pi if cx_mode == 'mag-phase' else None),
+                plan=None, plan_key=None, blit=None)
+            state['cids'] = [
+                fig.canvas.mpl_connect(
+                    name,
+                    lambda event, func=func, state=state: func(event, state))
+                for name, func in (
+                    ('button_press_event', _on_profile_press),
+                    ('motion_notify_event', _on_profile_motion),
+                    ('button_release_event', _on_profile_release))]
+            # : the profiles share the x-axis
+            profile_axs[0].callbacks.connect(
+                'xlim_changed',
+                lambda ax_, state=state: _decimate_profiles(state))
+
+        last_map, last_plan_key = state['map'], state['plan_key']
+        state['map'] = plot_ndarray_2d_map(
+            state['map_fig'], arr, params, '', plt_interactives,
+            data=data, state=last_map)
+        if state['map'] is None:
+            for cid in state['cids']:
+                fig.canvas.mpl_disconnect(cid)
+            return None
+        changed = state['map'] is not last_map
+        if changed:
+            # : the maps were created again, and so is the profile path
+            state['paths'] = [
+                part['pax'].axes.plot(
+                    *zip(*state['vertices']), marker='o', markersize=4,
+                    scalex=False, scaley=False)[0]
+                for part in state['map']['parts']]
+        for path in state['paths']:
+            if path.get_color() != params['profile-color']:
+                path.set_color(params['profile-color'])
+                changed = True
+        for ax, data_lim in zip(state['profile_axs'], data_lims):
+            if None not in data_lim \
+                    and tuple(ax.get_ylim()) != tuple(data_lim):
+                ax.set_ylim(data_lim)
+                changed = True
+        state['imgs'], state['step'] = imgs, step
+        _update_profiles(state)
+        if changed or state['map']['blit'] is None \
+                or state['plan_key'] != last_plan_key:
+            state['blit'] = None
+        else:
+            # : only the images, the profile path and the profiles changed
+            #   (the profile axes are redrawn as a whole)
+            state['blit'] = list(state['map']['blit']) + state['paths'] \
+                + list(state['profile_axs'])
+    except Exception as e:
+        if state is not None:
+            for cid in state['cids']:
+                fig.canvas.mpl_disconnect(cid)
+        state = None
+        fig.clf()
+        ax = fig.subplots(1)
+        ax.axis('off')
+        ax.set_aspect(1)
+        # text = traceback.format_exc(50)
+        text = '\n'.join(textwrap.wrap(str(e), 50))
+        ax.text(-0.15, 0.95, text, ha='left', va='top', family='monospace')
+        ax.set_title('WARNING: Plotting failed!', color='#999933')
+    else:
+        pass
+    finally:
+        # fig.tight_layout()
+        fig.suptitle(plt_title)
+    return state
+
+
+# ======================================================================
+def gen_interactives_2d_projection(arr):
+    interactives = collections.OrderedDict([
+        ('projection-axis', dict(
+            label='Projection axis', default=len(arr.shape) - 1,
+            start=0, stop=len(arr.shape) - 1, step=1)),
+        ('reduction', dict(
+            label='Projection', default='max',
+            values=numex.stats.REDUCTIONS)),
+    ])
+    interactives.update(gen_interactives_2d_map(arr))
+    return interactives
+
+
+# ======================================================================
+def _projections(arr):
+    return LRUCache()
+
+
+# ======================================================================
+def _project(key, arr, progress=None):
+    axis, reduction = key
+    if reduction in ('mean', 'std'):
+        # : the mean and the standard deviation share the same data pass
+        projections = numex.stats.cached(arr, 'projections', _projections)
+        moments = projections.compute(
+            (axis, 'moments'), lambda key_: numex.stats.moments(
+                arr, axis, progress=progress))
+        return numex.stats.from_moments(moments, reduction)
+    else:
+        return numex.stats.projection(
+            arr, axis, reduction, progress=progress)
+
+
+# ======================================================================
+def _projection_params(params):
+    # : the projected axis has a single element
+    params = type(params)(params)
+    params['index-{}'.format(params['projection-axis'])] = 0
+    return params
+
+
+# ======================================================================
+def prepare_ndarray_2d_projection(
+        arr=None,
+        params=None,
+        plt_interactives=None,
+        preview=False,
+        progress=None,
+        **_kws):
+    """
+    Prepare the data for `plot_ndarray_2d_projection()`.
+
+    The projection is computed streaming over the chunks of the array
+    (see `numex.stats.projection()`), and it is cached (within the global
+    memory budget) for each projection axis and reduction, so that
+    switching between them does not require reading the data again.
+    The projection is then prepared as in `prepare_ndarray_2d_map()`.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        params (dict): The parameters of the plot.
+        plt_interactives (dict): The interactive parameters information.
+        preview (bool): Prepare a preview of the data.
+            This is not available, and None is returned.
+        progress (callable|None): Report the progress of the projection.
+            See `numex.stats.projection()` for more info.
+        **_kws: Ignored.
+
+    Returns:
+        result (tuple|None): The tuple
+            contains:
+             - proj (np.ndarray): The projection.
+               The projected axis is kept (with size 1).
+             - imgs, data_lims, pyramids, step: See
+               `prepare_ndarray_2d_map()`.
+            If a preview is requested, None is returned.
+
+    Raises:
+        ValueError: If the projection axis is one of the axes to display.
+    """
+    axis = params['projection-axis']
+    if axis in (params['axis-0'], params['axis-1']):
+        text = '`{}` must differ from `{}` and `{}`!'.format(
+            plt_interactives['projection-axis']['label'],
+            plt_interactives['axis-0']['label'],
+            plt_interactives['axis-1']['label'])
+        raise ValueError(text)
+    if preview:
+        return None
+    projections = numex.stats.cached(arr, 'projections', _projections)
+    proj = projections.compute(
+        (axis, params['reduction']), _project, arr, progress)
+    return (proj,) + prepare_ndarray_2d_map(
+        proj, _projection_params(params), plt_interactives)
+
+
+# ======================================================================
+def plot_ndarray_2d_projection(
+        fig,
+        arr=None,
+        params=None,
+        plt_title='',
+        plt_interactives=None,
+        data=None,
+        state=None):
+    title = '{} ({} along Axis {})'.format(
+        plt_title, params['reduction'], params['projection-axis'])
+    last_title = state.get('title') if state is not None else None
+    try:
+        if data is None:
+            data = prepare_ndarray_2d_projection(
+                arr, params, plt_interactives)
+        proj, data = data[0], data[1:]
+        state = plot_ndarray_2d_map(
+            fig, proj, _projection_params(params), title, plt_interactives,
+            data=data, state=state)
+        if state is not None:
+            # : the title is not redrawn by blitting
+            if title != last_title:
+                state['blit'] = None
+            state['title'] = title
+    except Exception as e:
+        state = None
+        fig.clf()
+        ax = fig.subplots(1)
+        ax.axis('off')
+        ax.set_aspect(1)
+        # text = traceback.format_exc(50)
+        text = '\n'.join(textwrap.wrap(str(e), 50))
+        ax.text(-0.15, 0.95, text, ha='left', va='top', family='monospace')
+        ax.set_title('WARNING: Plotting failed!', color='#999933')
+        fig.suptitle(title)
+    return state
+
+
+# ======================================================================
+def gen_interactives_3d_ortho(arr):
+    n_digits = int(np.ceil(np.log10(len(arr.shape))))
+    interactives = collections.OrderedDict(
+        [('axis-{}'.format(i), dict(
+            label='{} axis'.format(x), default=i,
+            start=0, stop=len(arr.shape) - 1, step=1))
+         for i, x in enumerate(('x', 'y', 'z'))]
+        +
+        [('index-{}'.format(i), dict(
+            label='Index[{:0{n_digits}d}]'.format(i, n_digits=n_digits),
+            default=d // 2, start=0, stop=d - 1, step=1))
+         for i, d in enumerate(arr.shape)]
+        +
+        [('cmap-0', dict(
+            label='Color Map', default='gray', values=_table('COLORMAPS'))),
+         ('cursor', dict(label='Show Cursor', default=True)),
+         ('fast-render', dict(
+             label='Fast Rendering (Color LUT)', default=True))]
+    )
+    return interactives
+
+
+# ======================================================================
+def _ortho_axes(params):
+    # : the (x, y) axes of the three planes, each normal to one axis
+    axes = tuple(params['axis-{}'.format(i)] for i in range(3))
+    return (axes[0], axes[1]), (axes[2], axes[1]), (axes[0], axes[2])
+
+
+# ======================================================================
+def prepare_ndarray_3d_ortho(
+        arr=None,
+        params=None,
+        plt_interactives=None,
+        preview=False,
+        **_kws):
+    """
+    Prepare the data for `plot_ndarray_3d_ortho()`.
+
+    The three planes share the cache of the slices of the array with
+    `prepare_ndarray_2d_map()`, so that only the planes whose index changed
+    are read again.
+    The planes next to the displayed ones are prepared in advance in
+    background threads.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        params (dict): The parameters of the plot.
+        plt_interactives (dict): The interactive parameters information.
+        preview (bool): Prepare a preview of the data.
+            This is not available, and None is returned.
+        **_kws: Ignored.
+
+    Returns:
+        result (tuple|None): The tuple
+            contains:
+             - imgs (tuple[np.ndarray]): The images of the three planes.
+               For complex arrays, only the first part is shown.
+             - data_lim (tuple[float]): The limits of the data.
+             - keys (tuple): The cache keys of the three planes.
+            If a preview is requested, None is returned.
+
+    Raises:
+        ValueError: If the array has less than three dimensions, or if
+            the three axes are not different.
+    """
+    labels = tuple(
+        plt_interactives['axis-{}'.format(i)]['label'] for i in range(3))
+    if len(arr.shape) < 3:
+        text = 'At least 3 dimensions are required!'
+        raise ValueError(text)
+    elif len(set(params['axis-{}'.format(i)] for i in range(3))) < 3:
+        text = '`{}`, `{}` and `{}` must be different!'.format(*labels)
+        raise ValueError(text)
+    if preview:
+        return None
+    index = tuple(
+        v for k, v in params.items() if k.startswith('index-'))
+    cx_mode = params['cx_mode'] if np.iscomplexobj(arr) else None
+    slices = numex.stats.cached(arr, 'slices', _slices)
+    last_keys = slices['ortho_keys'] or (None,) * 3
+    keys, imgs = [], []
+    for axes, last_key in zip(_ortho_axes(params), last_keys):
+        indices = tuple(
+            None if i in axes else v for i, v in enumerate(index))
+        key = axes, indices, cx_mode
+        imgs.append(slices['cache'].compute(key, _slice_2d_map, arr)[0])
+        if key != last_key:
+            slices['cache'].prefetch(
+                _neighbors(key, last_key, arr.shape), _slice_2d_map, arr)
+        keys.append(key)
+    slices['ortho_keys'] = tuple(keys)
+    data_lim = numex.stats.data_limits(arr, params['cx_mode'])[0]
+    return tuple(imgs), data_lim, tuple(keys)
+
+
+# ======================================================================
+def plot_ndarray_3d_ortho(
+        fig,
+        arr=None,
+        params=None,
+        plt_title='',
+        plt_interactives=None,
+        data=None,
+        state=None):
+    try:
+        if data is None:
+            data = prepare_ndarray_3d_ortho(arr, params, plt_interactives)
+        imgs, data_lim, keys = data
+        cmap = params['cmap-0']
+        index = tuple(
+            v for k, v in params.items() if k.startswith('index-'))
+        layout = (
+            _ortho_axes(params), arr.shape, params['cursor'],
+            params['fast-render'])
+
+        if state is not None and state['layout'] == layout:
+            # : update the existing artists, only redrawing the views
+            #   whose plane or cursor changed
+            mappable = state['mappable']
+            changed = tuple(mappable.get_clim()) != tuple(data_lim) \
+                or mappable.get_cmap().name != cmap
+            if changed:
+                for part in state['parts']:
+                    for mappable in (state['mappable'], part['mappable']):
+                        mappable.set_clim(data_lim)
+                        mappable.set_cmap(cmap)
+                    if part['lut'] is not None:
+                        part['lut'] = numex.display.colormap_lut(cmap)
+            state['blit'] = []
+            for part, img_, key in zip(state['parts'], imgs, keys):
+                moved = False
+                if part['key'] != key or changed:
+                    _set_image(part, img_)
+                    part['key'] = key
+                    moved = True
+                x_axis, y_axis = key[0]
+                vline, hline = part['lines']
+                if vline.get_xdata()[0] != index[x_axis]:
+                    vline.set_xdata([index[x_axis]] * 2)
+                    moved = True
+                if hline.get_ydata()[0] != index[y_axis]:
+                    hline.set_ydata([index[y_axis]] * 2)
+                    moved = True
+                if moved:
+                    # : the image is redrawn below the cursor lines
+                    state['blit'].extend([part['pax']] + part['lines'])
+                if not np.all(np.isfinite(img_)):
+                    changed = True
+            if changed:
+                state['blit'] = None
+        else:
+            import matplotlib.cm
+            import matplotlib.colors
+
+            fig.clear()
+            axs = fig.subplots(nrows=2, ncols=2)
+            views = axs[0, 0], axs[0, 1], axs[1, 0]
+            # : the color scale is shown once for all views
+            mappable = matplotlib.cm.ScalarMappable(
+                matplotlib.colors.Normalize(*data_lim), cmap)
+            parts = []
+            for ax, img_, key in zip(views, imgs, keys):
+                x_axis, y_axis = key[0]
+                extent = (
+                    -0.5, img_.shape[1] - 0.5, -0.5, img_.shape[0] - 0.5)
+                if not params['fast-render']:
+                    pax = ax.imshow(
+                        img_, vmin=data_lim[0], vmax=data_lim[1],
+                        cmap=cmap, origin='lower', extent=extent)
+                    part = dict(pax=pax, mappable=pax, lut=None)
+                else:
+                    part = dict(
+                        mappable=mappable, rgba=None,
+                        lut=numex.display.colormap_lut(cmap))
+                    part['pax'] = ax.imshow(
+                        np.zeros(img_.shape + (4,), dtype=np.uint8),
+                        origin='lower', extent=extent)
+                    _set_image(part, img_)
+                part['key'] = key
+                part['lines'] = [
+                    ax.axvline(index[x_axis], color='#cc3333', lw=0.8),
+                    ax.axhline(index[y_axis], color='#cc3333', lw=0.8)]
+                for line in part['lines']:
+                    line.set_visible(params['cursor'])
+                ax.set_xlabel('Index of Axis {}'.format(x_axis))
+                ax.set_ylabel('Index of Axis {}'.format(y_axis))
+                parts.append(part)
+            axs[1, 1].axis('off')
+            cbar = fig.colorbar(mappable, ax=axs[1, 1], fraction=0.5)
+            cbar.ax.get_yaxis().labelpad = 15
+            cbar.ax.set_ylabel('Values / arb.units', rotation=-90)
+            state = dict(
+                layout=layout, parts=parts, mappable=mappable, blit=None)
+    except Exception as e:
+        state = None
+        fig.clf()
+        ax = fig.subplots(1)
+        ax.axis('off')
+        ax.set_aspect(1)
+        # text = traceback.format_exc(50)
+        text = '\n'.join(textwrap.wrap(str(e), 50))
+        ax.text(-0.15, 0.95, text, ha='left', va='top', family='monospace')
+        ax.set_title('WARNING: Plotting failed!', color='#999933')
+    else:
+        pass
+    finally:
+        # fig.tight_layout()
+        fig.suptitle(plt_title)
+    return state
+
+
+# ======================================================================
+def _explore(arr, mode):
+    # : the GUI modules are only imported in the process actually using them
+    shared = arr if isinstance(arr, SharedArray) else None
+    if shared is not None:
+        arr = shared.attach()
+    try:
+        plotting_func, interactives, title = plot_selector(arr, mode)
+        nme.interactive_tk_mpl.plotting(
+            plotting_func,
+            interactives=interactives, title=TITLE, about=__doc__, arr=arr,
+            plt_title=title, plt_interactives=interactives,
+            prepare_func=prepare_selector(plotting_func))
+    finally:
+        if shared is not None:
+            del arr
+            shared.release()
+
+
+# ======================================================================
+def serve(conn, client_conn=None):
+    """
+    Run the persistent viewer.
+
+    The viewer receives `(arr, mode)` requests through the connection and
+    shows each array in a new window of the same Tk application.
+    Arrays wrapped in `numex.sharing.SharedArray` are released when their
+    window is closed.
+    The viewer terminates when the connection is closed (e.g. because the
+    client process terminated) and all windows are closed.
+
+    Args:
+        conn (multiprocessing.connection.Connection): The connection.
+        client_conn (multiprocessing.connection.Connection|None): The
+            client end of the connection, which is closed (if inherited),
+            so that the viewer is notified when the client terminates.
+
+    Returns:
+        None.
+    """
+    import queue
+    import threading
+    import pytk
+
+    if client_conn is not None:
+        client_conn.close()
+
+    requests = queue.Queue()
+    windows = set()
+    state = dict(connected=True)
+
+    def _receive():
+        try:
+            while True:
+                requests.put(conn.recv())
+        except (EOFError, OSError):
+            requests.put(None)
+
+    def _open(arr, mode):
+        shared = arr if isinstance(arr, SharedArray) else None
+        if shared is not None:
+            arr = shared.attach()
+        try:
+            plotting_func, interactives, title = plot_selector(arr, mode)
+            win = nme.interactive_tk_mpl.plotting_window(
+                root, plotting_func,
+                interactives=interactives, title=TITLE, about=__doc__,
+                arr=arr, plt_title=title, plt_interactives=interactives,
+                prepare_func=prepare_selector(plotting_func))
+        except Exception:
+            if shared is not None:
+                shared.release()
+            raise
+
+        def _on_destroy(event):
+            if event.widget is win:
+                windows.discard(win)
+                if shared is not None:
+                    shared.release()
+
+        win.bind('<Destroy>', _on_destroy, add=True)
+        windows.add(win)
+
+    def _poll():
+        while not requests.empty():
+            request = requests.get_nowait()
+            if request is None:
+                state['connected'] = False
+            else:
+                try:
+                    _open(*request)
+                except Exception:
+                    traceback.print_exc()
+        if not state['connected'] and not windows:
+            root.destroy()
+        else:
+            root.after(SERVER_POLL_INTERVAL, _poll)
+
+    root = pytk.tk.Tk()
+    root.withdraw()
+    threading.Thread(target=_receive, daemon=True).start()
+    _poll()
+    root.mainloop()
+
+
+# ======================================================================
+def start_server():
+    """
+    Start the persistent viewer process, unless already running.
+
+    Returns:
+        proc (multiprocessing.Process): The viewer process.
+
+    See Also:
+        numex.gui_tk_mpl.serve(), numex.gui_tk_mpl.explore()
+    """
+    if 'proc' not in _SERVER or not _SERVER['proc'].is_alive():
+        ensure_tracker()
+        conn, server_conn = multiprocessing.Pipe()
+        proc = multiprocessing.Process(
+            target=serve, args=(server_conn, conn))
+        proc.start()
+        server_conn.close()
+        _SERVER.update(proc=proc, conn=conn)
+    return _SERVER['proc']
+
+
+# ======================================================================
+def stop_server():
+    """
+    Detach from the persistent viewer process (if running).
+
+    The viewer process terminates once all its windows are closed.
+
+    Returns:
+        None.
+    """
+    if 'conn' in _SERVER:
+        _SERVER['conn'].close()
+        _SERVER.clear()
 
 
 # ======================================================================
 def explore(
         arr,
         mode='auto',
-        spawn=True):
+        spawn=True,
+        server=False):
     """
     Explore a NumPy array.
 
@@ -432,21 +1946,42 @@ def explore(
             This is useful for interactive sessions.
             If False, the execution of the script is blocked until the data
             is being explored.
+            If the process requires the data to be pickled (depending on
+            the start method), the data is shared with the process without
+            copies (see `numex.sharing.SharedArray`), and the shared memory
+            is released when the window is closed.
+        server (bool): Use the persistent viewer process.
+            If True, the data is shown in a new window of a single viewer
+            process, which is started at the first use (see
+            `numex.gui_tk_mpl.start_server()`), and the data is shared
+            with it without copies.
+            This avoids paying the startup of the GUI at each call.
+            If True, `spawn` is ignored.
 
     Returns:
         None.
     """
-    plotting_func, interactives, title = plot_selector(arr, mode)
-    plotting_kws = dict(
-        interactives=interactives, title=TITLE, about=__doc__, arr=arr,
-        plt_title=title, plt_interactives=interactives)
-    if spawn:
-        proc = multiprocessing.Process(
-            target=nme.interactive_tk_mpl.plotting,
-            args=(plotting_func,), kwargs=plotting_kws)
-        proc.start()
+    if server:
+        start_server()
+        shared = SharedArray(arr)
+        try:
+            _SERVER['conn'].send((shared, mode))
+        except Exception:
+            shared.release()
+            raise
+    elif spawn:
+        if multiprocessing.get_start_method() != 'fork':
+            # : forked processes already share the data (copy-on-write)
+            arr = SharedArray(arr)
+        proc = multiprocessing.Process(target=_explore, args=(arr, mode))
+        try:
+            proc.start()
+        except Exception:
+            if isinstance(arr, SharedArray):
+                arr.release()
+            raise
     else:
-        nme.interactive_tk_mpl.plotting(plotting_func, **plotting_kws)
+        _explore(arr, mode)
 
 
 # ======================================================================
@@ -481,9 +2016,21 @@ def handle_arg():
     arg_parser.add_argument(
         '-t', '--file_type', metavar='TYPE', default=None,
         help='File type of input [%(default)s]')
+    arg_parser.add_argument(
+        '-s', '--selected', metavar='NAME', default=None,
+        help='Variable/member to load from multi-array files [%(default)s]')
     arg_parser.add_argument(
         '-m', '--mode', metavar='MODE', default=None,
         help='Visualization of data mode [%(default)s]')
+    arg_parser.add_argument(
+        '-c', '--cache-budget', metavar='SIZE', default=None,
+        help='Memory budget of the caches in bytes, e.g. 512M or 4G '
+             '(also set by ${}) [%(default)s]'.format(
+            numex.cache.BUDGET_ENV))
+    arg_parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='print the time spent on each import at startup [%(default)s]')
     return arg_parser
 
 
@@ -499,11 +2046,22 @@ def main():
     if args.verbose >= VERB_LVL['debug']:
         arg_parser.print_help()
         msg('\nARGS: ' + str(vars(args)), args.verbose, VERB_LVL['debug'])
+    msg(MY_GREETINGS, args.verbose, D_VERB_LVL)
+    if args.cache_budget is not None:
+        numex.cache.BUDGET.limit = numex.cache.parse_size(args.cache_budget)
+        # : also used by the GUI process
+        os.environ[numex.cache.BUDGET_ENV] = args.cache_budget
 
     loader = io_selector(args.in_filepath, args.file_type)
-    arr = loader(args.in_filepath)
+    load_kws = dict(selected=args.selected) if args.selected else {}
+    arr = loader(args.in_filepath, **load_kws)
     explore(arr, args.mode, spawn=True)
 
+    if args.profile_startup:
+        # : include the GUI modules (otherwise imported by the GUI process)
+        importlib.import_module('numex.interactive_tk_mpl')
+        msg(nme.report_imports())
+
     elapsed(__file__[len(PATH['base']) + 1:])
     msg(report())
 
@@ -9,6 +9,24 @@ In particular, two objects need to be defined:
 - a plotting function, which must accept:
     - a `matplotlib.Axes` where the plot is shown (this is used internally)
     - the dictionary of parameters for which interactivity is desired
+  optionally, to update the plot in place, the function may return a `dict`
+  describing its artists (the "state"), which is passed back to the next call
+  as the `state` keyword argument; in this case the figure is not cleared
+  before the call, and if the 'blit' item of the state lists the only
+  artists that changed, only these are redrawn
+- optionally, a data preparation function, which must accept the parameters
+  (and the same keyword arguments) of the plotting function, except the
+  figure, and whose result is passed to the plotting function as the `data`
+  keyword argument; this is run in a background thread, so that reading and
+  processing the data does not block the GUI; this is first called with
+  `preview=True`, to obtain a quick approximation of the data (or None, if
+  not available), which is plotted while the actual data is prepared;
+  the `progress` keyword argument is a function which may be called with
+  the amount of work done and the total amount of work, to show the
+  progress of lengthy preparations; if the preparation was superseded by
+  a newer one, this raises `Superseded`, which should not be caught, so
+  that the preparation is aborted; errors of the preparation are shown
+  in place of the plot
 - an ordered dictionary with interactivity information, where the key
   correspond to the internal name of the parameter (useful for kwargs magic),
   and the value is a dictionary with the following required fields:
@@ -59,6 +77,9 @@ import collections  # Container datatypes
 import datetime  # Basic date and time types
 import doctest  # Test interactive Python examples
 import json  # JSON encoder and decoder [JSON: JavaScript Object Notation]
+import functools  # Higher-order functions and operations on callable objects
+import textwrap  # Text wrapping and filling
+import concurrent.futures  # Launching parallel tasks
 
 # :: External Imports
 import matplotlib as mpl  # Matplotlib (2D/3D plotting library)
@@ -70,6 +91,7 @@ import matplotlib.backends.backend_tkagg as tkagg
 
 # :: Local Imports
 import numex as nme
+import numex.cache
 
 from numex import INFO, PATH, MY_GREETINGS
 # from numex import VERB_LVL, D_VERB_LVL, VERB_LVL_NAMES
@@ -81,6 +103,18 @@ _MIN_WIDTH = 320
 _MIN_HEIGHT = 200
 _WIDTH = 960
 _HEIGHT = 600
+# minimum time between consecutive plot updates (in ms)
+_REDRAW_INTERVAL = 40
+# time between checks for the data prepared in the background (in ms)
+_PREPARE_POLL_INTERVAL = 10
+
+
+# ======================================================================
+class Superseded(Exception):
+    """
+    The data preparation was superseded by a newer one.
+    """
+    pass
 
 
 # ======================================================================
@@ -130,9 +164,22 @@ class PytkMain(pytk.widgets.Frame):
             about=__doc__,
             width=_WIDTH, height=_HEIGHT,
             min_width=_MIN_WIDTH, min_height=_MIN_HEIGHT,
+            redraw_interval=_REDRAW_INTERVAL,
+            prepare_func=None,
             **func_kwargs):
         self.func = func
         self.func_kwargs = func_kwargs
+        self.prepare_func = prepare_func
+        self._prepare_worker = None
+        self._prepare_future = None
+        self._preview_future = None
+        self._prepare_job = None
+        self._prepare_request = 0
+        self._prepare_progress = None
+        self.plot_state = None
+        self.plot_params = None
+        self.redraw_interval = redraw_interval
+        self._redraw_job = None
         self.interactives = interactives
         self.about = about
         self.cwd = '.'
@@ -154,6 +201,10 @@ class PytkMain(pytk.widgets.Frame):
         self._make_menu()
 
         # :: define UI items
+        # : status bar
+        self.lblStatus = pytk.widgets.Label(self, anchor='w')
+        self.lblStatus.pack(side='bottom', fill='x', padx=8, pady=2)
+
         # : main
         self.frmMain = pytk.widgets.Frame(self)
         self.frmMain.pack(fill='both', padx=4, pady=4, expand=True)
@@ -233,6 +284,19 @@ class PytkMain(pytk.widgets.Frame):
         self._bind_interactions()
         self.actionReset()
 
+    def destroy(self):
+        for job in (self._redraw_job, self._prepare_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._redraw_job = self._prepare_job = None
+        if self._prepare_worker is not None:
+            for future in (self._preview_future, self._prepare_future):
+                if future is not None:
+                    future.cancel()
+            self._prepare_worker.shutdown(wait=False)
+            self._prepare_worker = None
+        super(PytkMain, self).destroy()
+
     def _make_menu(self):
         self.mnuMain = pytk.widgets.Menu(self.parent, tearoff=False)
         self.parent.config(menu=self.mnuMain)
@@ -251,15 +315,13 @@ class PytkMain(pytk.widgets.Frame):
 
     def _bind_interactions(self):
         for k, v in self.wdgInteractives.items():
-            v['trace'] = v['var'].trace('w', self.actionPlotUpdate)
+            v['trace'] = v['var'].trace('w', self.schedulePlotUpdate)
 
     def _unbind_interactions(self):
         for k, v in self.wdgInteractives.items():
             v['var'].trace_vdelete('w', v['trace'])
 
-    def actionPlotUpdate(self, *_args):
-        """Update the plot."""
-        self.fig.clear()
+    def _get_params(self):
         if hasattr(self, 'wdgInteractives'):
             params = {}
             for k, v in self.wdgInteractives.items():
@@ -272,8 +334,150 @@ class PytkMain(pytk.widgets.Frame):
                 params[k] = val
         else:
             params = {k: v['default'] for k, v in self.interactives.items()}
-        self.func(fig=self.fig, params=params, **self.func_kwargs)
+        return params
+
+    def schedulePlotUpdate(self, *_args):
+        """
+        Schedule the update of the plot.
+
+        Bursts of parameter changes (e.g. while dragging a slider) result in
+        a single update, performed when the GUI is idle and at most once
+        every `redraw_interval` ms, using the latest parameters.
+        """
+        if self._redraw_job is None:
+            self._redraw_job = self.after(
+                self.redraw_interval, self._idlePlotUpdate)
+
+    def _idlePlotUpdate(self):
+        self._redraw_job = self.after_idle(self._scheduledPlotUpdate)
+
+    def _scheduledPlotUpdate(self):
+        self._redraw_job = None
+        # : skip the update if the parameters did not actually change
+        if self._get_params() != self.plot_params:
+            self.actionPlotUpdate()
+
+    def _prepare(self, request, params, preview=False):
+        # : skip requests superseded before being started
+        if request != self._prepare_request:
+            return None
+        return self.prepare_func(
+            params=params, preview=preview,
+            progress=functools.partial(self._set_progress, request),
+            **self.func_kwargs)
+
+    def _set_progress(self, request, done, total):
+        # : called from the background thread, shown by `_pollPrepared()`
+        if request != self._prepare_request:
+            # : abort the preparation, so that the latest request is not
+            #   waiting behind it
+            raise Superseded()
+        self._prepare_progress = done, total
+
+    def _pollPrepared(self):
+        self._prepare_job = None
+        future = self._prepare_future
+        preview = self._preview_future
+        if preview is not None and preview.done():
+            self._preview_future = None
+            # : the preview is only shown while waiting for the data
+            if future is not None and not future.done() \
+                    and not preview.cancelled() \
+                    and preview.exception() is None \
+                    and preview.result() is not None:
+                self._plot(self.plot_params, preview.result())
+        if future is None:
+            return
+        elif not future.done():
+            if self._prepare_progress is not None:
+                self._update_status()
+            self._prepare_job = self.after(
+                _PREPARE_POLL_INTERVAL, self._pollPrepared)
+            return
+        self._prepare_future = None
+        self._prepare_progress = None
+        self.config(cursor='')
+        if future.cancelled():
+            return
+        try:
+            data = future.result()
+        except Exception as e:
+            # : the plotting function would prepare the data again (on
+            #   the GUI thread), hence the error is shown directly
+            self._plot_error(e)
+        else:
+            self._plot(self.plot_params, data)
+
+    def _plot_error(self, error):
+        self.plot_state = None
+        self.fig.clf()
+        ax = self.fig.subplots(1)
+        ax.axis('off')
+        ax.set_aspect(1)
+        text = '\n'.join(textwrap.wrap(str(error), 50))
+        ax.text(-0.15, 0.95, text, ha='left', va='top', family='monospace')
+        ax.set_title('WARNING: Plotting failed!', color='#999933')
         self.canvas.draw()
+        self._update_status()
+
+    def _plot(self, params, data=None):
+        if self.plot_state is None:
+            self.fig.clear()
+        kws = dict(self.func_kwargs)
+        if data is not None:
+            kws['data'] = data
+        if self.plot_state is not None:
+            kws['state'] = self.plot_state
+        state = self.func(fig=self.fig, params=params, **kws)
+        self.plot_state = state if isinstance(state, dict) else None
+        artists = self.plot_state.get('blit') if self.plot_state else None
+        if artists:
+            axs = []
+            for artist in artists:
+                artist.axes.draw_artist(artist)
+                if artist.axes not in axs:
+                    axs.append(artist.axes)
+            for ax in axs:
+                self.canvas.blit(ax.bbox)
+        else:
+            self.canvas.draw()
+        self._update_status()
+
+    def _update_status(self):
+        text = numex.cache.BUDGET.status()
+        if self._prepare_progress is not None:
+            done, total = self._prepare_progress
+            text = 'Preparing: {:.0%} | {}'.format(done / total, text)
+        self.lblStatus.config(text=text)
+
+    def actionPlotUpdate(self, *_args):
+        """Update the plot."""
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+            self._redraw_job = None
+        params = self._get_params()
+        self.plot_params = params
+        if self.prepare_func is None:
+            self._plot(params)
+        else:
+            # : prepare the data in the background, superseding any pending
+            #   request, and plot it when ready
+            if self._prepare_worker is None:
+                self._prepare_worker = \
+                    concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            for future in (self._preview_future, self._prepare_future):
+                if future is not None:
+                    future.cancel()
+            self._prepare_request += 1
+            self._prepare_progress = None
+            self._preview_future = self._prepare_worker.submit(
+                self._prepare, self._prepare_request, params, True)
+            self._prepare_future = self._prepare_worker.submit(
+                self._prepare, self._prepare_request, params)
+            self.config(cursor='watch')
+            if self._prepare_job is None:
+                self._prepare_job = self.after(
+                    _PREPARE_POLL_INTERVAL, self._pollPrepared)
 
     def actionExit(self, event=None):
         """Action on Exit."""
@@ -348,6 +552,35 @@ def plotting(
     return root
 
 
+# ======================================================================
+def plotting_window(
+        parent,
+        func,
+        interactives,
+        gui_main=PytkMain,
+        resources_path=None,
+        *_args,
+        **_kws):
+    """
+    Show an interactive plot in a new window of a running Tk application.
+
+    This is useful to avoid paying the startup of a new Tk application
+    for each plot. See `plotting()` for the parameters.
+
+    Args:
+        parent (tkinter.Misc): The parent widget (e.g. the Tk root).
+
+    Returns:
+        win (tkinter.Toplevel): The new window.
+    """
+    win = pytk.tk.Toplevel(parent)
+    app = gui_main(win, func, interactives, *_args, **_kws)
+    if resources_path is None:
+        resources_path = PATH['resources']
+    pytk.util.set_icon(win, 'icon', resources_path)
+    return win
+
+
 # ======================================================================
 elapsed(__file__[len(PATH['base']) + 1:])
 
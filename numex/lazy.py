@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumEx: lazily-loaded array-like objects.
+
+These objects expose the minimal ndarray interface needed for exploration
+(`shape`, `dtype`, `ndim`, `size` and basic slicing), while reading from
+the underlying data source only the portion actually requested.
+"""
+
+# ======================================================================
+# :: Future Imports
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals, )
+
+# ======================================================================
+# :: Python Standard Library Imports
+import os  # Miscellaneous operating system interfaces
+import threading  # Thread-based parallelism
+import concurrent.futures  # Launching parallel tasks
+
+# ======================================================================
+# :: External Imports
+import numpy as np  # NumPy (multidimensional numerical arrays library)
+
+
+# ======================================================================
+class LazyArray(object):
+    """
+    Array-like object fetching the data from its source only upon slicing.
+
+    The source must expose a `shape` attribute and support NumPy-like basic
+    slicing (integers, slices and Ellipsis).
+    If an opener is specified, the source is (re-)created on demand by
+    calling it, so that the object can be pickled (e.g. to be sent to a
+    different process) even when the source itself cannot (e.g. open files).
+
+    Examples:
+        >>> arr = np.arange(2 * 3 * 4).reshape((2, 3, 4))
+        >>> lazy_arr = LazyArray(arr, func=lambda x: x * 2)
+        >>> lazy_arr.shape, lazy_arr.ndim, lazy_arr.size
+        ((2, 3, 4), 3, 24)
+        >>> lazy_arr[1, :, 0]
+        array([24, 32, 40])
+        >>> np.array_equal(np.asarray(lazy_arr), arr * 2)
+        True
+    """
+
+    def __init__(
+            self,
+            source=None,
+            opener=None,
+            shape=None,
+            dtype=None,
+            func=None,
+            order='C',
+            n_workers=1):
+        """
+        Args:
+            source (Any|None): The data source.
+                If None, `opener` is used to create it.
+            opener (callable|None): Create the data source.
+                Must accept no arguments and must be picklable
+                (e.g. a module-level function or a `functools.partial`).
+            shape (Iterable[int]|None): The shape of the array.
+                If None, this is taken from the data source.
+            dtype (np.dtype|None): The data type of the array.
+                If None, this is determined by reading a single element.
+            func (callable|None): Function applied to each sliced chunk.
+                Useful for scaling or type conversion of the raw data.
+                Must preserve the shape of its input.
+            order (str): The memory layout of the source, 'C' or 'F'.
+                This determines the axis along which reading in chunks is
+                most efficient (the first for 'C', the last for 'F').
+            n_workers (int|None): The number of workers for full reads.
+                If larger than 1 (or None, for the number of CPUs) and
+                `opener` is given, full reads are split in chunks (see
+                `order`) and distributed to a pool of threads, each with
+                its own data source.
+                This is only beneficial if the source supports fast
+                random access.
+        """
+        if source is None:
+            source = opener()
+        self._source = source
+        self.opener = opener
+        self.func = func
+        self.order = order
+        self.n_workers = n_workers
+        self.shape = tuple(
+            int(dim) for dim in (source.shape if shape is None else shape))
+        self._dtype = np.dtype(dtype) if dtype is not None else None
+
+    @property
+    def source(self):
+        if self._source is None:
+            self._source = self.opener()
+        return self._source
+
+    @property
+    def dtype(self):
+        if self._dtype is None:
+            if self.size > 0:
+                self._dtype = self[(0,) * self.ndim].dtype
+            else:
+                self._dtype = np.dtype(self.source.dtype)
+        return self._dtype
+
+    @property
+    def chunk_axis(self):
+        return self.ndim - 1 if self.order == 'F' else 0
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    @property
+    def real(self):
+        return np.asarray(self).real
+
+    @property
+    def imag(self):
+        return np.asarray(self).imag
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        arr = np.asarray(self.source[key])
+        if self.func is not None:
+            arr = self.func(arr)
+        return arr
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.read()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def read(self):
+        """
+        Read the whole array.
+
+        Returns:
+            arr (np.ndarray): The array data.
+        """
+        axis = self.chunk_axis
+        if self.opener is None or self.n_workers == 1 or self.ndim == 0 \
+                or self.shape[axis] < 2:
+            return self[(slice(None),) * self.ndim]
+
+        n_workers = self.n_workers or os.cpu_count() or 1
+        step = max(1, -(-self.shape[axis] // n_workers))
+        arr = np.empty(self.shape, dtype=self.dtype)
+        local = threading.local()
+
+        def _read_chunk(i):
+            if not hasattr(local, 'source'):
+                local.source = self.opener()
+            index = [slice(None)] * self.ndim
+            index[axis] = slice(i, i + step)
+            index = tuple(index)
+            chunk = np.asarray(local.source[index])
+            if self.func is not None:
+                chunk = self.func(chunk)
+            arr[index] = chunk
+
+        with concurrent.futures.ThreadPoolExecutor(n_workers) as pool:
+            list(pool.map(_read_chunk, range(0, self.shape[axis], step)))
+        return arr
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.opener is not None:
+            state['_source'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def __repr__(self):
+        return '{}(shape={}, dtype={})'.format(
+            self.__class__.__name__, self.shape, self.dtype)
@@ -1,9 +1,226 @@
-import os  # Miscellaneous operating system interfaces
+"""
+NumEx: I/O plugins.
 
-# import all files in the directory
-__all__ = [
-    os.path.splitext(filename)[0]
-    for filename in os.listdir(os.path.dirname(__file__))
-    if os.path.isfile(filename) and filename.endswith('.py')]
+Each plugin declares, in `PLUGINS`, the file extensions and the magic numbers
+it supports, so that the correct plugin can be selected without importing
+any plugin (and its possibly heavy dependencies) in advance.
+The plugin module is only imported when its loader is actually requested.
+Upon import, a plugin registers its loaders in `EXT` for the extensions
+it can actually handle (e.g. depending on optional dependencies).
 
-EXT = {}
+Third-party loaders can be added through the `numex.plugins` entry point
+group, where the entry point name is the file extension, e.g.:
+
+    entry_points={'numex.plugins': ['ext = package.module:load']}
+"""
+import os
+import importlib
+import collections
+
+ENTRY_POINT_GROUP = 'numex.plugins'
+
+# : name -> (extensions, magic numbers by extension as (offset, bytes) pairs)
+#   extensions without magic numbers are for headerless files
+PLUGINS = collections.OrderedDict([
+    ('io_numpy', (
+        ('npy', 'npz'),
+        {'npy': ((0, b'\x93NUMPY'),), 'npz': ((0, b'PK\x03\x04'),)})),
+    ('io_matlab', (
+        ('mat',),
+        {'mat': ((0, b'MATLAB'),)})),
+    ('io_nibabel', (
+        ('nii', 'nii.gz'),
+        {'nii': ((344, b'n+1\x00'), (4, b'n+2\x00')),
+         'nii.gz': ((0, b'\x1f\x8b'),)})),
+    ('io_bart_cfl', (
+        ('cfl', 'hdr'),
+        {'hdr': ((0, b'# Dimensions'),)})),
+])
+
+__all__ = ['synthetic'] + list(PLUGINS)
+
+
+# ======================================================================
+def _entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return ()
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return eps.select(group=ENTRY_POINT_GROUP)
+    else:
+        return eps.get(ENTRY_POINT_GROUP, ())
+
+
+# ======================================================================
+class Loaders(dict):
+    """
+    Mapping of file extensions to loaders, importing plugins on demand.
+    """
+
+    def __missing__(self, ext):
+        for name, (exts, magics) in PLUGINS.items():
+            if ext in exts:
+                importlib.import_module(__name__ + '.' + name)
+                if dict.__contains__(self, ext):
+                    return dict.__getitem__(self, ext)
+        for entry_point in _entry_points():
+            if entry_point.name == ext:
+                loader = entry_point.load()
+                self[ext] = loader
+                return loader
+        raise KeyError(ext)
+
+    def __contains__(self, ext):
+        return ext in extensions()
+
+
+EXT = Loaders()
+
+
+# ======================================================================
+def extensions():
+    """
+    List the supported file extensions.
+
+    Returns:
+        exts (list[str]): The file extensions (without leading separator).
+    """
+    exts = list(dict.keys(EXT))
+    exts.extend(
+        ext for exts_, magics in PLUGINS.values() for ext in exts_
+        if ext not in exts)
+    exts.extend(
+        entry_point.name for entry_point in _entry_points()
+        if entry_point.name not in exts)
+    return exts
+
+
+# ======================================================================
+def _magics(ext):
+    for exts, magics in PLUGINS.values():
+        if ext in exts:
+            return magics.get(ext, ())
+    return ()
+
+
+# ======================================================================
+def sniff(filepath):
+    """
+    Detect the file types supported by a file from its magic numbers.
+
+    Args:
+        filepath (str): The input file path.
+
+    Returns:
+        exts (list[str]): The matching file types (as file extensions).
+
+    Examples:
+        >>> import tempfile
+        >>> dirpath = tempfile.mkdtemp()
+        >>> filepath = os.path.join(dirpath, 'data.bin')
+        >>> with open(filepath, 'wb') as file_obj:
+        ...     _ = file_obj.write(b'\\x93NUMPY\\x01\\x00')
+        >>> sniff(filepath)
+        ['npy']
+    """
+    size = max(
+        offset + len(magic)
+        for exts, magics in PLUGINS.values()
+        for magics_ in magics.values() for offset, magic in magics_)
+    with open(filepath, 'rb') as file_obj:
+        header = file_obj.read(size)
+    return [
+        ext for exts, magics in PLUGINS.values()
+        for ext, magics_ in magics.items()
+        if any(
+            header[offset:offset + len(magic)] == magic
+            for offset, magic in magics_)]
+
+
+# ======================================================================
+def select(
+        filepath,
+        file_type=None):
+    """
+    Select the loader for a file.
+
+    The loader is chosen from:
+     - the file type, if specified;
+     - the file extension, if consistent with the file header, or if the
+       file type has no magic numbers (i.e. headerless files);
+     - the file header, using the magic numbers of the plugins;
+     - the file extension alone.
+
+    Only the plugin providing the selected loader is imported.
+
+    Args:
+        filepath (str): The input file path.
+        file_type (str|None): The file type.
+            This is any supported file extension (without leading separator).
+            If None or not supported, it is detected automatically.
+
+    Returns:
+        loader (callable): The loader, accepting the file path as first
+            argument, and returning an array-like object.
+
+    Raises:
+        ValueError: If no suitable loader could be found.
+
+    Examples:
+        >>> import tempfile
+        >>> dirpath = tempfile.mkdtemp()
+        >>> def write(filename, data):
+        ...     filepath = os.path.join(dirpath, filename)
+        ...     with open(filepath, 'wb') as file_obj:
+        ...         _ = file_obj.write(data)
+        ...     return filepath
+
+        Headerless files are selected by extension, whatever their content:
+
+        >>> select(write('z.cfl', b'\\x1f\\x8b\\x10\\x40' * 4)).__module__
+        'numex.plugins.io_bart_cfl'
+
+        The header is used if it contradicts the extension, or if the
+        extension is not supported:
+
+        >>> select(write('z.nii', b'\\x93NUMPY' + bytes(400))).__module__
+        'numex.plugins.io_numpy'
+        >>> select(write('z.bin', b'\\x93NUMPY' + bytes(400))).__module__
+        'numex.plugins.io_numpy'
+        >>> select(write('z.bin', bytes(400)))
+        Traceback (most recent call last):
+            ...
+        ValueError: Could not load data from `...z.bin`.
+    """
+    if file_type is not None:
+        try:
+            return EXT[file_type]
+        except KeyError:
+            pass
+
+    basename = os.path.basename(filepath).lower()
+    exts = sorted(
+        (ext for ext in extensions() if basename.endswith('.' + ext)),
+        key=len, reverse=True)
+    sniffed = sniff(filepath) if os.path.isfile(filepath) else []
+    for ext in exts:
+        if not _magics(ext) or ext in sniffed:
+            try:
+                return EXT[ext]
+            except KeyError:
+                pass
+    # : the header contradicts the extension, or the extension is unknown
+    for ext in sniffed:
+        try:
+            return EXT[ext]
+        except KeyError:
+            pass
+    for ext in exts:
+        try:
+            return EXT[ext]
+        except KeyError:
+            pass
+    text = 'Could not load data from `{}`.'.format(filepath)
+    raise ValueError(text)
@@ -1,9 +1,15 @@
 from numex.plugins import EXT
 import numpy as np
 
+# minimum data size (in bytes) for memory-mapping to be used by default
+MMAP_MIN_SIZE = 2 ** 26
+
 
 # ======================================================================
-def load(filepath):
+def load(
+        filepath,
+        mmap=None,
+        selected=None):
     """
     Load a BART's CFL/HDR data/header pair of files.
 
@@ -11,9 +17,17 @@ def load(filepath):
         filepath (str): The input filepath.
             Can be either '.hdr' / '.cfl' files.
             Both files must exist.
+        mmap (bool|None): Memory-map the data file.
+            If True, the data is memory-mapped (read-only) and only the
+            portions actually accessed are read from disk.
+            If False, the data is fully read into memory.
+            If None, the data is memory-mapped only if its size in bytes
+            is at least `MMAP_MIN_SIZE`.
+        selected (str|None): Ignored.
+            The files contain a single array.
 
     Returns:
-        arr (ndarray): The array data.
+        arr (ndarray|memmap): The array data.
     """
 
     # determine base filepath
@@ -30,18 +44,25 @@ def load(filepath):
     # obtain the shape of the image
     shape = [int(i) for i in dim_line.strip().split(' ')]
     # remove trailing singleton dimensions from shape
-    while shape[-1] == 1:
+    while len(shape) > 1 and shape[-1] == 1:
         shape.pop(-1)
     # calculate the data size
     data_size = int(np.prod(shape))
 
-    # load data
-    with open(base_filepath + '.cfl', 'r') as data_file:
-        arr = np.fromfile(
-            data_file, dtype=np.complex64, count=data_size)
+    dtype = np.dtype(np.complex64)
+    if mmap is None:
+        mmap = data_size * dtype.itemsize >= MMAP_MIN_SIZE
 
     # note: BART uses FORTRAN-style memory allocation
-    return arr.reshape(shape, order='F')
+    if mmap:
+        arr = np.memmap(
+            base_filepath + '.cfl', dtype=dtype, mode='r',
+            shape=tuple(shape), order='F')
+    else:
+        with open(base_filepath + '.cfl', 'rb') as data_file:
+            arr = np.fromfile(data_file, dtype=dtype, count=data_size)
+        arr = arr.reshape(shape, order='F')
+    return arr
 
 
 EXT['cfl'] = load
@@ -1,70 +1,165 @@
 from numex.plugins import EXT
+import functools
+
 import numpy as np
 
+from numex.lazy import LazyArray
+
 try:
     import h5py
 except ImportError:
     h5py = None
 
 try:
-    from scipy.io import loadmat
+    from scipy.io import loadmat, whosmat
 except ImportError:
-    loadmat = None
+    loadmat = whosmat = None
+
+HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+# MATLAB v7.3+ files are HDF5 files with a 512 bytes user block
+HDF5_OFFSETS = (0, 512)
+# MATLAB classes of the numeric (and logical) arrays
+NUMERIC_CLASSES = (
+    'double', 'single', 'logical',
+    'int8', 'int16', 'int32', 'int64',
+    'uint8', 'uint16', 'uint32', 'uint64')
 
 
 # ======================================================================
-def load(
-        filepath,
-        selected=None,
-        *_args,
-        **_kws):
+def is_hdf5(filepath):
     """
-    Read a MATLAB file.
-
-    File versions v4 (Level 1.0), v6 and v7 to 7.2 are supported through SciPy.
-    File versions v7.3+ are supported through h5py.
+    Determine if a MATLAB file is HDF5-based (i.e. v7.3+) from its header.
 
     Args:
         filepath (str): The input filepath.
 
     Returns:
-        arr (ndarray): The array data.
+        result (bool): True if the file is HDF5-based, False otherwise.
     """
+    with open(filepath, 'rb') as file_obj:
+        for offset in HDF5_OFFSETS:
+            file_obj.seek(offset)
+            if file_obj.read(len(HDF5_SIGNATURE)) == HDF5_SIGNATURE:
+                return True
+    return False
 
-    # Load MATLAB v4 (Level 1.0), v6 and v7 to 7.2 files
-    try:
-        from scipy.io import loadmat
 
+# ======================================================================
+def _h5_dataset(filepath, name):
+    return h5py.File(filepath, 'r')[name]
+
+
+# ======================================================================
+def _is_h5_complex(dtype):
+    return bool(dtype.names) and set(dtype.names) == {'real', 'imag'}
+
+
+# ======================================================================
+def _h5_complex(arr):
+    return arr['real'] + 1j * arr['imag'] if arr.dtype.names else arr
 
-        mats = loadmat(filepath, *_args, **_kws)
-    except ImportError:
-        mats = None
-    except NotImplementedError:
-        mats = None
 
-    # Load MATLAB v7.3+ files
-    try:
-        import h5py
+# ======================================================================
+def _h5_class(obj):
+    class_name = obj.attrs.get('MATLAB_class', None)
+    if isinstance(class_name, bytes):
+        class_name = class_name.decode('ascii', 'replace')
+    return class_name
 
 
-        mats = h5py.File(filepath, 'r')
-    except ImportError:
-        mats = None
+# ======================================================================
+def _h5_variables(h5_file):
+    """
+    Collect the numeric datasets of a MATLAB v7.3+ file.
 
-    if mats is not None:
-        data = {}
-        for k, v in mats.items():
-            data[k] = np.array(v)
+    Only the metadata of the datasets is accessed.
+    The datasets are selected by their MATLAB class (if available), as for
+    older files, skipping e.g. character arrays and empty variables.
 
-        if selected is None:
+    Args:
+        h5_file (h5py.File): The input file.
 
-            for k, v in data.items():
-                if selected is None or v.size > data[selected]:
-                    selected = k
-        return data[selected]
+    Returns:
+        variables (dict[str:h5py.Dataset]): The datasets by name.
+    """
+    variables = {}
+
+    def _visit(name, obj):
+        if isinstance(obj, h5py.Dataset) and not name.startswith('#') \
+                and (obj.dtype.kind in 'biufc' or _is_h5_complex(obj.dtype)) \
+                and _h5_class(obj) in NUMERIC_CLASSES + (None,) \
+                and not obj.attrs.get('MATLAB_empty', 0):
+            variables[name] = obj
+
+    h5_file.visititems(_visit)
+    return variables
+
+
+# ======================================================================
+def load(
+        filepath,
+        selected=None,
+        *_args,
+        **_kws):
+    """
+    Read a MATLAB file.
+
+    File versions v4 (Level 1.0), v6 and v7 to 7.2 are supported through SciPy.
+    File versions v7.3+ are supported through h5py.
+    The backend is chosen from the file header, and only the metadata is
+    used to select the variable, so that only the selected variable is read.
+    Variables from v7.3+ files are not read at all, but sliced on demand.
+
+    Args:
+        filepath (str): The input filepath.
+        selected (str|None): The name of the variable to load.
+            If None, the largest variable is selected.
+        *_args: Positional arguments for `scipy.io.loadmat()`.
+        **_kws: Keyword arguments for `scipy.io.loadmat()`.
+
+    Returns:
+        arr (ndarray|LazyArray): The array data.
+    """
+    use_h5py = is_hdf5(filepath)
+    if use_h5py:
+        if h5py is None:
+            text = 'Could not load data from MATLAB file `{}` (no h5py)' \
+                .format(filepath)
+            raise IOError(text)
+        with h5py.File(filepath, 'r') as h5_file:
+            shapes = {
+                k: (v.shape, v.dtype)
+                for k, v in _h5_variables(h5_file).items()}
     else:
+        if loadmat is None:
+            text = 'Could not load data from MATLAB file `{}` (no SciPy)' \
+                .format(filepath)
+            raise IOError(text)
+        shapes = {
+            name: (shape, None) for name, shape, class_name
+            in whosmat(filepath) if class_name in NUMERIC_CLASSES}
+
+    if not shapes:
         text = 'Could not load data from MATLAB file `{}`'.format(filepath)
         raise IOError(text)
+    if selected is None:
+        selected = max(shapes, key=lambda k: int(np.prod(shapes[k][0])))
+    elif selected not in shapes:
+        text = 'Could not find `{}` in MATLAB file `{}`'.format(
+            selected, filepath)
+        raise ValueError(text)
+
+    if use_h5py:
+        shape, dtype = shapes[selected]
+        if dtype.names:
+            dtype = np.result_type(dtype['real'], np.complex64)
+        arr = LazyArray(
+            opener=functools.partial(_h5_dataset, filepath, selected),
+            shape=shape, dtype=dtype, func=_h5_complex)
+    else:
+        arr = loadmat(
+            filepath, *_args, variable_names=[selected], **_kws)[selected]
+    return arr
 
 
 EXT['mat'] = load
@@ -1,30 +1,139 @@
 from numex.plugins import EXT
+import os
+import hashlib
+import functools
+
+from numex import PATH
+from numex.lazy import LazyArray
 
 try:
     import nibabel as nib
+except ImportError:
+    nib = None
+
+try:
+    import indexed_gzip as igzip
+except ImportError:
+    igzip = None
+
+GZIP_INDEX_EXT = '.gzidx'
+# distance (in uncompressed bytes) between seek points of the gzip index
+GZIP_INDEX_SPACING = 2 ** 22
+
+
+# ======================================================================
+def gzip_index_filepath(filepath):
+    """
+    Determine the file path of the seek-point index of a gzip file.
+
+    The index is stored next to the gzip file, if its directory is writable,
+    otherwise it is stored in the cache directory.
+
+    Args:
+        filepath (str): The gzip file path.
+
+    Returns:
+        index_filepath (str): The index file path.
+    """
+    filepath = os.path.realpath(filepath)
+    index_filepath = filepath + GZIP_INDEX_EXT
+    if not os.path.isfile(index_filepath) \
+            and not os.access(os.path.dirname(filepath), os.W_OK):
+        index_filepath = os.path.join(
+            PATH['cache'],
+            hashlib.md5(filepath.encode('utf-8')).hexdigest()
+            + GZIP_INDEX_EXT)
+    return index_filepath
 
 
-    def load(filepath, **_kws):
-        """
-        Load a NiBabel-supported file.
+# ======================================================================
+def open_gzip(
+        filepath,
+        spacing=GZIP_INDEX_SPACING):
+    """
+    Open a gzip file for random access using a persistent seek-point index.
 
-        Args:
-            filepath (str): The input file path.
-            kws (dict|Iterable): Keyword arguments for `nibabel.load()`.
+    The index is built (with a single decompression pass) the first time
+    the file is opened, and then saved to disk, so that later accesses to
+    any offset only need decompressing from the closest seek point.
+    The index is rebuilt if it is older than the gzip file.
 
-        Returns:
-            arr (np.ndarray): The array data.
+    Args:
+        filepath (str): The gzip file path.
+        spacing (int): The distance between seek points in bytes.
 
-        See Also:
-            nibabel.load(), nibabel.get_data(), nibabel.get_affine(),
-            nibabel.get_header()
-        """
-        obj = nib.load(filepath, **_kws)
-        return obj.get_data()
+    Returns:
+        file_obj (indexed_gzip.IndexedGzipFile): The file object.
+    """
+    index_filepath = gzip_index_filepath(filepath)
+    if os.path.isfile(index_filepath) \
+            and os.path.getmtime(index_filepath) \
+            >= os.path.getmtime(filepath):
+        file_obj = igzip.IndexedGzipFile(
+            filepath, index_file=index_filepath)
+    else:
+        file_obj = igzip.IndexedGzipFile(filepath, spacing=spacing)
+        file_obj.build_full_index()
+        try:
+            file_obj.export_index(index_filepath)
+        except (IOError, OSError):
+            pass
+    return file_obj
 
 
+# ======================================================================
+def _dataobj(filepath, mmap=True, **_kws):
+    img = nib.load(filepath, mmap=mmap, **_kws)
+    if igzip is not None and filepath.endswith('.gz') \
+            and nib.is_proxy(img.dataobj):
+        # : the header is read by nibabel, the data through the index
+        proxy = img.dataobj
+        spec = (
+            proxy.shape, proxy.dtype, proxy.offset, proxy.slope, proxy.inter)
+        return img.ImageArrayProxy(
+            open_gzip(filepath), spec, order=proxy.order)
+    else:
+        return img.dataobj
+
+
+# ======================================================================
+def load(
+        filepath,
+        mmap=True,
+        selected=None,
+        **_kws):
+    """
+    Load a NiBabel-supported file.
+
+    The data is not read upon loading, but sliced on demand from the
+    image data object (an array proxy for file-based images), which also
+    takes care of applying the scaling (if any) to the sliced data only.
+
+    If `indexed_gzip` is available, gzip-compressed files are accessed
+    through a persistent seek-point index (see `open_gzip()`), so that
+    any slice can be read without decompressing from the start of the file,
+    and full reads are split across a pool of threads.
+
+    Args:
+        filepath (str): The input file path.
+        mmap (bool|str): Memory-map the data (uncompressed files only).
+            See `nibabel.load()` for more info.
+        selected (str|None): Ignored.
+            The files contain a single array.
+        **_kws: Keyword arguments for `nibabel.load()`.
+
+    Returns:
+        arr (LazyArray): The array data.
+
+    See Also:
+        nibabel.load(), nibabel.arrayproxy.ArrayProxy
+    """
+    random_access = igzip is not None or not filepath.endswith('.gz')
+    return LazyArray(
+        opener=functools.partial(_dataobj, filepath, mmap, **_kws),
+        order='F', n_workers=None if random_access else 1)
+
+
+if nib is not None:
     EXT['nii'] = load
     EXT['nii.gz'] = load
-
-except ImportError:
-    pass
@@ -1,24 +1,144 @@
 from numex.plugins import EXT
+import struct
+import zipfile
+import collections
+
 import numpy as np
+import numpy.lib.format
+
+
+# ======================================================================
+def is_npy(filepath):
+    """
+    Determine if a file is a NumPy `.npy` file from its magic number.
 
+    Args:
+        filepath (str): The input file path.
 
+    Returns:
+        result (bool): True if the file is a `.npy` file, False otherwise.
+    """
+    magic = np.lib.format.MAGIC_PREFIX
+    with open(filepath, 'rb') as file_obj:
+        return file_obj.read(len(magic)) == magic
+
+
+# ======================================================================
+def members(filepath):
+    """
+    List the arrays contained in a NumPy `.npz` archive.
+
+    Only the zip directory and the `.npy` headers of the members are read,
+    therefore no member data is decompressed.
+
+    Args:
+        filepath (str): The input file path.
+
+    Returns:
+        infos (collections.OrderedDict): The array information.
+            The keys are the member names (without the `.npy` extension).
+            The values are dicts with the following fields:
+             - 'shape' (tuple[int]): The shape of the array.
+             - 'dtype' (np.dtype): The data type of the array.
+             - 'order' (str): The memory layout, either 'C' or 'F'.
+             - 'offset' (int|None): The offset of the array data within
+               the archive, if the member is stored uncompressed, or None.
+    """
+    infos = collections.OrderedDict()
+    with zipfile.ZipFile(filepath, 'r') as zip_file:
+        for zip_info in zip_file.infolist():
+            if not zip_info.filename.endswith('.npy'):
+                continue
+            with zip_file.open(zip_info, 'r') as member_file:
+                version = np.lib.format.read_magic(member_file)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(member_file)
+                else:
+                    header = np.lib.format.read_array_header_2_0(member_file)
+                shape, fortran_order, dtype = header
+                offset = None
+                if zip_info.compress_type == zipfile.ZIP_STORED \
+                        and not dtype.hasobject:
+                    header_size = member_file.tell()
+                    offset = _stored_offset(filepath, zip_info) + header_size
+            infos[zip_info.filename[:-len('.npy')]] = dict(
+                shape=shape, dtype=dtype, order='F' if fortran_order else 'C',
+                offset=offset)
+    return infos
+
+
+# ======================================================================
+def _stored_offset(filepath, zip_info):
+    """
+    Compute the offset of the data of a zip archive member.
+
+    Args:
+        filepath (str): The zip archive file path.
+        zip_info (zipfile.ZipInfo): The information on the member.
+
+    Returns:
+        offset (int): The offset of the member data within the archive.
+    """
+    # : the local header may differ from the central directory entry
+    with open(filepath, 'rb') as file_obj:
+        file_obj.seek(zip_info.header_offset)
+        local_header = file_obj.read(zipfile.sizeFileHeader)
+    name_size, extra_size = struct.unpack('<HH', local_header[26:30])
+    return (
+        zip_info.header_offset + zipfile.sizeFileHeader
+        + name_size + extra_size)
+
+
+# ======================================================================
 def load(
         filepath,
+        selected=None,
+        mmap_mode='r',
         *_args,
         **_kws):
     """
     Load a NumPy array.
 
+    Both `.npy` files and `.npz` archives are supported.
+    Data is memory-mapped, unless otherwise specified.
+    For archives, only the selected member is loaded, and uncompressed
+    members are memory-mapped directly from within the archive.
+
     Args:
         filepath (str): The input file path.
+        selected (str|None): The member to load from `.npz` archives.
+            If None, the largest member is selected.
+            This is ignored for `.npy` files.
+        mmap_mode (str|None): The memory-mapping mode.
+            See `np.load()` for more info.
+            If None, data is fully read into memory.
         *_args: Positional arguments for `np.load()`.
         **_kws: Keyword arguments for `np.load()`.
 
     Returns:
-        arr (np.ndarray): The array data.
+        arr (np.ndarray|np.memmap): The array data.
     """
-    arr = np.load(filepath, *_args, **_kws)
+    if is_npy(filepath):
+        arr = np.load(filepath, mmap_mode, *_args, **_kws)
+    else:
+        infos = members(filepath)
+        if selected is None:
+            selected = max(
+                infos, key=lambda k: int(np.prod(infos[k]['shape'])))
+        elif selected not in infos:
+            text = 'Could not find `{}` in `{}`'.format(selected, filepath)
+            raise ValueError(text)
+        info = infos[selected]
+        if mmap_mode and info['offset'] is not None:
+            arr = np.memmap(
+                filepath, dtype=info['dtype'], mode=mmap_mode,
+                offset=info['offset'], shape=info['shape'],
+                order=info['order'])
+        else:
+            with np.load(filepath, None, *_args, **_kws) as arrs:
+                arr = arrs[selected]
     return arr
 
 
 EXT['npy'] = load
+EXT['npz'] = load
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumEx: statistics within regions of interest (ROI).
+
+The masks of the ROIs are computed with vectorized operations and cached
+for each ROI geometry, so that the statistics of the same ROI over
+different images (e.g. other slices, or all the indices of another axis
+at once) only require gathering and reducing the masked values.
+"""
+
+# ======================================================================
+# :: Future Imports
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals, )
+
+# ======================================================================
+# :: Python Standard Library Imports
+import functools  # Higher-order functions and operations on callable objects
+
+# ======================================================================
+# :: External Imports
+import numpy as np  # NumPy (multidimensional numerical arrays library)
+
+# kinds of ROI available
+KINDS = ('rectangle', 'ellipse', 'polygon')
+
+# percentiles included in the statistics
+PERCENTILES = (5, 50, 95)
+
+
+# ======================================================================
+@functools.lru_cache(maxsize=32)
+def mask(
+        shape,
+        kind,
+        geometry):
+    """
+    Compute the mask of a ROI over an image.
+
+    A pixel belongs to the ROI if its center is within the ROI.
+    The result is cached for each ROI geometry.
+
+    Args:
+        shape (tuple[int]): The shape of the image.
+        kind (str): The kind of the ROI.
+            Accepted values are listed in `KINDS`.
+        geometry (tuple): The geometry of the ROI.
+            The x and y coordinates are the column and row indices.
+            For 'rectangle' and 'ellipse', this is the bounding box
+            (x_min, x_max, y_min, y_max).
+            For 'polygon', these are the (x, y) vertices.
+
+    Returns:
+        result (tuple): The tuple
+            contains:
+             - index (tuple[slice]): The bounding box within the image.
+             - mask (np.ndarray): The mask within the bounding box.
+
+    Raises:
+        ValueError: If the kind of the ROI is not supported.
+
+    Examples:
+        >>> index, mask_ = mask((5, 6), 'ellipse', (0.5, 4.5, 0.5, 3.5))
+        >>> index
+        (slice(1, 4, None), slice(1, 5, None))
+        >>> mask_.astype(int)
+        array([[0, 1, 1, 0],
+               [1, 1, 1, 1],
+               [0, 1, 1, 0]])
+        >>> vertices = ((-0.5, -0.5), (4.6, -0.5), (-0.5, 4.6))
+        >>> int(mask((5, 6), 'polygon', vertices)[1].sum())
+        15
+
+        ROIs without any pixel center give an empty mask:
+
+        >>> bool(mask((5, 6), 'rectangle', (2.2, 2.2, 3.3, 3.3))[1].any())
+        False
+        >>> mask((5, 6), 'ellipse', (10, 12, 1, 3))
+        ((slice(1, 4, None), slice(6, 6, None)), array([], shape=(3, 0), dtype=bool))
+    """
+    if kind not in KINDS:
+        text = 'Unsupported ROI kind `{}`.'.format(kind)
+        raise ValueError(text)
+    points = np.array(geometry, dtype=float).reshape(
+        (-1, 2) if kind == 'polygon' else (2, 2))
+    if kind == 'polygon':
+        points = points.T
+    index = tuple(
+        slice(
+            int(min(max(np.ceil(np.min(coords)), 0), size)),
+            int(min(max(np.floor(np.max(coords)) + 1, 0), size)))
+        for coords, size in zip(points[::-1], shape))
+    y_arr, x_arr = (
+        np.arange(s.start, s.stop, dtype=float).reshape(shape_)
+        for s, shape_ in zip(index, ((-1, 1), (1, -1))))
+    if kind == 'rectangle':
+        result = np.ones((len(y_arr), x_arr.size), dtype=bool)
+    elif kind == 'ellipse':
+        (x_min, x_max), (y_min, y_max) = points
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = \
+                ((2 * x_arr - x_min - x_max) / (x_max - x_min)) ** 2 \
+                + ((2 * y_arr - y_min - y_max) / (y_max - y_min)) ** 2 <= 1
+    else:  # if kind == 'polygon':
+        import matplotlib.path
+
+        x_arr, y_arr = np.broadcast_arrays(x_arr, y_arr)
+        result = matplotlib.path.Path(points.T).contains_points(
+            np.stack([x_arr.ravel(), y_arr.ravel()], axis=-1)).reshape(
+            x_arr.shape)
+    result.flags.writeable = False
+    return index, result
+
+
+# ======================================================================
+def statistics(values):
+    """
+    Compute the statistics of (batches of) values.
+
+    All batches are reduced at once, with vectorized operations.
+    Non-finite values are ignored.
+
+    Args:
+        values (np.ndarray): The input values.
+            The values of each batch are along the last axis.
+
+    Returns:
+        result (dict): The statistics of each batch.
+            The keys are: 'count', 'mean', 'std', 'min', 'max', and
+            'p<N>' for each of the `PERCENTILES`, e.g. 'p50'.
+            For batches without valid values, the count is 0 and the
+            other statistics are NaN.
+
+    Examples:
+        >>> values = np.array([[1.0, 2.0, 3.0, np.nan], [4, 4, 4, 4]])
+        >>> stats = statistics(values)
+        >>> stats['count'].tolist(), stats['mean'].tolist()
+        ([3, 4], [2.0, 4.0])
+        >>> [stats[k].tolist() for k in ('min', 'p50', 'p95')]
+        [[1.0, 4.0], [2.0, 4.0], [2.9, 4.0]]
+        >>> stats = statistics(np.zeros((2, 0)))
+        >>> stats['count'].tolist(), stats['mean'].tolist()
+        ([0, 0], [nan, nan])
+        >>> float(statistics([])['p95'])
+        nan
+    """
+    values = np.array(values, dtype=float)
+    if values.shape[-1] == 0:
+        # : a single invalid value, so that the statistics are undefined
+        values = np.full(values.shape[:-1] + (1,), np.nan)
+    values[~np.isfinite(values)] = np.nan
+    # : invalid values are sorted last
+    values.sort(axis=-1)
+    count = np.sum(~np.isnan(values), axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(values, axis=-1) / count
+        std = np.sqrt(
+            np.nansum((values - mean[..., None]) ** 2, axis=-1) / count)
+    result = dict(count=count, mean=mean, std=std)
+    last = np.maximum(count - 1, 0)
+    for name, percentile in \
+            [('min', 0), ('max', 100)] \
+            + [('p{}'.format(q), q) for q in PERCENTILES]:
+        pos = percentile / 100 * last
+        before = np.floor(pos).astype(int)
+        after = np.minimum(before + 1, last)
+        value_before, value_after = (
+            np.take_along_axis(values, i[..., None], axis=-1)[..., 0]
+            for i in (before, after))
+        result[name] = np.where(
+            count > 0,
+            value_before + (value_after - value_before) * (pos - before),
+            np.nan)
+    return result
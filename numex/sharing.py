@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumEx: zero-copy sharing of arrays between processes.
+
+Arrays are handed over to other processes without pickling their data:
+in-memory arrays are placed in a shared memory segment, while memory-mapped
+arrays are re-opened from their file.
+"""
+
+# ======================================================================
+# :: Future Imports
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals, )
+
+# ======================================================================
+# :: Python Standard Library Imports
+import mmap  # Memory-mapped file support
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+# ======================================================================
+# :: External Imports
+import numpy as np  # NumPy (multidimensional numerical arrays library)
+
+
+# ======================================================================
+def _order(arr):
+    return 'F' if arr.flags.f_contiguous and not arr.flags.c_contiguous \
+        else 'C'
+
+
+# ======================================================================
+def ensure_tracker():
+    """
+    Start the tracker of the shared memory segments, if not running yet.
+
+    Processes started afterwards use the same tracker, so that a segment
+    created by one process can be removed by another without the tracker
+    attempting to remove it again.
+
+    Returns:
+        None.
+    """
+    try:
+        from multiprocessing import resource_tracker
+    except ImportError:
+        pass
+    else:
+        resource_tracker.ensure_running()
+
+
+# ======================================================================
+class SharedArray(object):
+    """
+    Picklable handle to an array which does not copy the array data.
+
+    - Memory-mapped arrays (spanning the whole mapping) are re-opened
+      (read-only) from their file.
+    - Other arrays are copied once into a shared memory segment, which
+      other processes attach to without further copies.
+    - Any other object (e.g. lazily-loaded arrays) is kept as is.
+
+    The process using the array should call `attach()` to obtain the array,
+    and `release()` when done, which also removes the shared memory segment.
+
+    Examples:
+        >>> arr = np.arange(12).reshape((3, 4))
+        >>> shared = SharedArray(arr)
+        >>> shared_arr = shared.attach()
+        >>> np.array_equal(arr, shared_arr)
+        True
+        >>> del shared_arr
+        >>> shared.release()
+    """
+
+    def __init__(self, arr):
+        """
+        Args:
+            arr (np.ndarray|Any): The input array.
+        """
+        self.arr = None
+        self.filepath = None
+        self.name = None
+        self._shm = None
+        if isinstance(arr, np.ndarray):
+            self.shape = arr.shape
+            self.dtype = arr.dtype
+            self.order = _order(arr)
+        if isinstance(arr, np.memmap) and isinstance(arr.base, mmap.mmap) \
+                and arr.filename and (
+                arr.flags.c_contiguous or arr.flags.f_contiguous):
+            if arr.flags.writeable:
+                arr.flush()
+            self.filepath = arr.filename
+            self.offset = arr.offset
+        elif isinstance(arr, np.ndarray) and shared_memory is not None \
+                and arr.nbytes > 0 and not arr.dtype.hasobject:
+            shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+            shared_arr = np.ndarray(
+                arr.shape, arr.dtype, buffer=shm.buf, order=self.order)
+            shared_arr[...] = arr
+            del shared_arr
+            self.name = shm.name
+            shm.close()
+        else:
+            self.arr = arr
+
+    def attach(self):
+        """
+        Obtain the shared array.
+
+        Returns:
+            arr (np.ndarray|Any): The shared array.
+        """
+        if self.filepath is not None:
+            return np.memmap(
+                self.filepath, dtype=self.dtype, mode='r',
+                offset=self.offset, shape=self.shape, order=self.order)
+        elif self.name is not None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            return np.ndarray(
+                self.shape, self.dtype, buffer=self._shm.buf,
+                order=self.order)
+        else:
+            return self.arr
+
+    def release(self):
+        """
+        Release the shared array, removing the shared memory segment (if any).
+
+        Returns:
+            None.
+        """
+        if self.name is not None:
+            shm = self._shm
+            if shm is None:
+                shm = shared_memory.SharedMemory(name=self.name)
+            shm.unlink()
+            try:
+                shm.close()
+            except BufferError:
+                # : arrays using the segment still exist, the memory is
+                #   released when they are (or the process terminates)
+                pass
+            self._shm = None
+            self.name = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_shm'] = None
+        return state
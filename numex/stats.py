@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumEx: cached statistics of the explored arrays.
+
+Statistics over the whole array (e.g. the data limits used for the color
+scales) are computed once per array, streaming over chunks, so that large
+memory-mapped or lazily-loaded arrays never need to be fully in memory,
+and are cached for as long as the array exists.
+"""
+
+# ======================================================================
+# :: Future Imports
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals, )
+
+# ======================================================================
+# :: Python Standard Library Imports
+import os  # Miscellaneous operating system interfaces
+import threading  # Thread-based parallelism
+import weakref  # Weak references
+import itertools  # Functions creating iterators for efficient looping
+import collections  # Container datatypes
+import concurrent.futures  # Launching parallel tasks
+
+# ======================================================================
+# :: External Imports
+import numpy as np  # NumPy (multidimensional numerical arrays library)
+
+# maximum size (in bytes) of the chunks used for streaming over arrays
+CHUNK_SIZE = 2 ** 25
+
+# number of values sampled from each array for the percentiles
+SAMPLE_SIZE = 2 ** 18
+
+# reductions available for the projections (see `projection()`)
+REDUCTIONS = ('max', 'mean', 'std', 'min')
+
+# :: Statistics cache, by array identity
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+# ======================================================================
+def chunk_axis(arr):
+    """
+    Determine the axis along which the array is best read in chunks.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+
+    Returns:
+        axis (int): The axis for reading chunks.
+    """
+    if hasattr(arr, 'chunk_axis'):
+        return arr.chunk_axis
+    elif isinstance(arr, np.ndarray) \
+            and arr.flags.f_contiguous and not arr.flags.c_contiguous:
+        return arr.ndim - 1
+    else:
+        return 0
+
+
+# ======================================================================
+def _chunk_step(arr, chunk_size, axis):
+    size = arr.shape[axis]
+    item_size = arr.size // size * arr.dtype.itemsize if size else 1
+    return max(1, chunk_size // max(1, item_size))
+
+
+# ======================================================================
+def iter_chunks(
+        arr,
+        chunk_size=CHUNK_SIZE,
+        axis=None):
+    """
+    Iterate over consecutive chunks of an array.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        chunk_size (int): The maximum size of the chunks in bytes.
+            At least one element along the chunking axis is always taken.
+        axis (int|None): The axis along which the chunks are taken.
+            If None, this is determined by `chunk_axis()`.
+
+    Yields:
+        index (tuple[slice]): The index of the chunk within the array.
+        chunk (np.ndarray): The chunk data.
+
+    Examples:
+        >>> arr = np.arange(24).reshape((4, 6))
+        >>> [chunk.shape for index, chunk in iter_chunks(arr, 6 * 8 * 3)]
+        [(3, 6), (1, 6)]
+    """
+    if arr.ndim == 0:
+        yield (), np.asarray(arr[()])
+        return
+    if axis is None:
+        axis = chunk_axis(arr)
+    size = arr.shape[axis]
+    step = _chunk_step(arr, chunk_size, axis)
+    for i in range(0, size, step):
+        index = [slice(None)] * arr.ndim
+        index[axis] = slice(i, i + step)
+        index = tuple(index)
+        yield index, np.asarray(arr[index])
+
+
+# ======================================================================
+def cached(arr, key, func):
+    """
+    Get a statistic of an array, computing it only the first time.
+
+    The cache entries are removed when the array is garbage-collected.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+            Must support weak references.
+        key (Hashable): The identifier of the statistic.
+        func (callable): Compute the statistic.
+            Must accept the array as its only argument.
+
+    Returns:
+        result (Any): The statistic.
+    """
+    arr_id = id(arr)
+    with _LOCK:
+        if arr_id not in _CACHE:
+            _CACHE[arr_id] = {}
+            weakref.finalize(arr, _CACHE.pop, arr_id, None)
+        entry = _CACHE[arr_id]
+    if key not in entry:
+        entry[key] = func(arr)
+    return entry[key]
+
+
+# ======================================================================
+def peek(arr, key, default=None):
+    """
+    Get a statistic of an array only if already computed.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        key (Hashable): The identifier of the statistic.
+        default (Any): The value returned if the statistic is not cached.
+
+    Returns:
+        result (Any): The statistic.
+    """
+    with _LOCK:
+        return _CACHE.get(id(arr), {}).get(key, default)
+
+
+# ======================================================================
+def _extrema(arr):
+    """
+    Compute the extrema of an array with a single pass over its chunks.
+
+    Non-finite values are ignored.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+
+    Returns:
+        result (dict): The extrema.
+            For real arrays, the keys are: 'min', 'max'.
+            For complex arrays, the keys are: 'real_min', 'real_max',
+            'imag_min', 'imag_max', 'abs_max'.
+    """
+    result = {}
+    for index, chunk in iter_chunks(arr):
+        chunk = chunk[np.isfinite(chunk)]
+        if chunk.size == 0:
+            continue
+        if np.iscomplexobj(chunk):
+            values = dict(
+                real_min=np.min(chunk.real), real_max=np.max(chunk.real),
+                imag_min=np.min(chunk.imag), imag_max=np.max(chunk.imag),
+                abs_max=np.max(np.abs(chunk)))
+        else:
+            values = dict(min=np.min(chunk), max=np.max(chunk))
+        for name, value in values.items():
+            value = value.item()
+            if name in result:
+                func = min if name.endswith('min') else max
+                value = func(result[name], value)
+            result[name] = value
+    return result
+
+
+# ======================================================================
+def data_limits(
+        arr,
+        cx_mode='real-imag',
+        percentiles=None,
+        progress=None):
+    """
+    Compute the limits of the array data for display purposes.
+
+    The data is scanned only once per array (see `cached()`).
+    If percentiles are requested, a sample of (about) `SAMPLE_SIZE` values
+    is also taken and sorted once per array (see `sample()`), and then each
+    query only requires interpolating between two sampled values (see
+    `sample_percentiles()`), instead of sorting the whole array.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        cx_mode (str): The display mode for complex data.
+            Accepted values are:
+             - 'real-imag': real and imaginary parts, sharing the limits;
+             - 'mag-phase': magnitude and phase.
+            This is ignored for real arrays.
+        percentiles (Sequence[float]|None): The lower and upper percentiles.
+            If None, the extrema are used.
+            For the phase, the full (-pi, pi) range is always used.
+        progress (callable|None): Report the progress of the sampling.
+            See `sample()` for more info.
+
+    Returns:
+        data_lims (tuple[tuple[float]]): The limits for each displayed part.
+            For real arrays, a single (min, max) pair is returned.
+            For complex arrays, two (min, max) pairs are returned,
+            one for each displayed part.
+
+    Examples:
+        >>> data_limits(np.arange(10))
+        ((0, 9),)
+        >>> data_limits(np.array([1.0, np.nan, -1.0]))
+        ((-1.0, 1.0),)
+        >>> data_limits(np.array([1 + 2j, -3 - 4j]))
+        ((-4.0, 2.0), (-4.0, 2.0))
+        >>> data_limits(np.array([3 + 4j]), 'mag-phase')
+        ((0, 5.0), (-3.141592653589793, 3.141592653589793))
+        >>> arr = np.arange(1000.0)
+        >>> arr[0] = 1e9
+        >>> data_limits(arr, percentiles=(1, 99))
+        ((10.99, 990.01),)
+    """
+    extrema = cached(arr, 'extrema', _extrema)
+    if not extrema:
+        return ((None, None),) * (2 if np.iscomplexobj(arr) else 1)
+    elif percentiles is not None:
+        samples = cached(
+            arr, 'samples', lambda arr_: _samples(arr_, progress=progress))
+        if not np.iscomplexobj(arr):
+            return (sample_percentiles(samples['values'], percentiles),)
+        elif cx_mode == 'mag-phase':
+            return (
+                sample_percentiles(samples['abs'], percentiles),
+                (-np.pi, np.pi))
+        else:
+            data_lim = sample_percentiles(samples['real-imag'], percentiles)
+            return (data_lim, data_lim)
+    elif not np.iscomplexobj(arr):
+        return ((extrema['min'], extrema['max']),)
+    elif cx_mode == 'mag-phase':
+        return ((0, extrema['abs_max']), (-np.pi, np.pi))
+    else:
+        data_lim = (
+            min(extrema['real_min'], extrema['imag_min']),
+            max(extrema['real_max'], extrema['imag_max']))
+        return (data_lim, data_lim)
+
+
+# ======================================================================
+def sample(
+        arr,
+        size=SAMPLE_SIZE,
+        seed=0,
+        progress=None):
+    """
+    Sample the finite values of an array with a single pass over its chunks.
+
+    Each chunk contributes in proportion to its size (stratified sampling),
+    so that the sample is spread over the whole array.
+    If the array has no more values than requested, all values are taken.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        size (int): The (approximate) number of values to sample.
+        seed (int|None): The seed of the random number generator.
+        progress (callable|None): Report the progress.
+            Must accept the number of processed chunks and the total number
+            of chunks.
+
+    Returns:
+        values (np.ndarray): The sampled values, as a 1D array.
+
+    Examples:
+        >>> sample(np.array([[3.0, np.nan], [1.0, 2.0]])).tolist()
+        [3.0, 1.0, 2.0]
+        >>> sample(np.random.random((100, 1000)), 500).size
+        500
+    """
+    rng = np.random.default_rng(seed)
+    ratio = min(1.0, size / max(arr.size, 1))
+    axis = chunk_axis(arr) if arr.ndim else 0
+    n_chunks = -(-arr.shape[axis] // _chunk_step(arr, CHUNK_SIZE, axis)) \
+        if arr.ndim else 1
+    values = []
+    expected = 0.0
+    n_taken = 0
+    for i, (index, chunk) in enumerate(iter_chunks(arr)):
+        expected += chunk.size * ratio
+        num = int(round(expected)) - n_taken
+        n_taken += num
+        if ratio < 1.0:
+            chunk = chunk[np.unravel_index(
+                rng.integers(0, chunk.size, num), chunk.shape)]
+        chunk = chunk.ravel()
+        values.append(chunk[np.isfinite(chunk)])
+        if progress is not None:
+            progress(i + 1, n_chunks)
+    return np.concatenate(values) if values else np.zeros(0, arr.dtype)
+
+
+# ======================================================================
+def sample_percentiles(
+        values,
+        percentiles=(0, 100)):
+    """
+    Compute percentiles from sorted values.
+
+    Once the values (e.g. a sample of an array, see `sample()`) are sorted,
+    each query only requires interpolating between two values.
+
+    Args:
+        values (np.ndarray): The sorted values.
+        percentiles (Sequence[float]): The percentiles in the [0, 100] range.
+
+    Returns:
+        result (tuple[float|None]): The percentiles.
+            These match `np.percentile()` with linear interpolation.
+            If there are no values, None is returned for each percentile.
+
+    Examples:
+        >>> sample_percentiles(np.arange(11.0), (0, 5, 50, 100))
+        (0.0, 0.5, 5.0, 10.0)
+        >>> sample_percentiles(np.zeros(0), (1, 99))
+        (None, None)
+    """
+    if len(values) == 0:
+        return (None,) * len(percentiles)
+    positions = np.asarray(percentiles, dtype=float) / 100 * (len(values) - 1)
+    before = np.floor(positions).astype(int)
+    after = np.minimum(before + 1, len(values) - 1)
+    return tuple(
+        float(x) for x in
+        values[before] + (values[after] - values[before]) * (
+            positions - before))
+
+
+# ======================================================================
+def _samples(
+        arr,
+        progress=None):
+    """
+    Sample the values of an array for computing percentiles.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        progress (callable|None): Report the progress.
+            See `sample()` for more info.
+
+    Returns:
+        result (dict): The sorted samples.
+            For real arrays, the keys are: 'values'.
+            For complex arrays, the keys are: 'real-imag' (the real and
+            the imaginary parts together), 'abs'.
+    """
+    values = sample(arr, progress=progress)
+    if not np.iscomplexobj(values):
+        result = dict(values=values.astype(float))
+    else:
+        result = {
+            'real-imag': np.concatenate([values.real, values.imag]),
+            'abs': np.abs(values)}
+    for values in result.values():
+        values.sort()
+    return result
+
+
+# ======================================================================
+def _partial_extremum(chunk, axis, func):
+    if np.iscomplexobj(chunk):
+        chunk = np.abs(chunk)
+    # : NaN values are ignored, unless all values are NaN
+    return func.reduce(chunk, axis=axis, keepdims=True),
+
+
+# ======================================================================
+def _partial_moments(chunk, axis):
+    mask = np.isfinite(chunk)
+    count = np.sum(mask, axis=axis, keepdims=True)
+    chunk = np.where(mask, chunk, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.sum(chunk, axis=axis, keepdims=True) / count
+    dev2 = np.where(mask, np.abs(chunk - mean) ** 2, 0)
+    return count, mean, np.sum(dev2, axis=axis, keepdims=True)
+
+
+# ======================================================================
+def _combine_moments(moments_a, moments_b):
+    # : pairwise update of mean and sum of squared deviations (Chan et al.)
+    count_a, mean_a, m2_a = moments_a
+    count_b, mean_b, m2_b = moments_b
+    count = count_a + count_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = mean_b - mean_a
+        mean = np.where(
+            count_a == 0, mean_b,
+            np.where(count_b == 0, mean_a, mean_a + delta * count_b / count))
+        m2 = m2_a + m2_b + np.where(
+            (count_a > 0) & (count_b > 0),
+            np.abs(delta) ** 2 * count_a * count_b / count, 0)
+    return count, mean, m2
+
+
+# ======================================================================
+def _reduce_chunks(
+        arr,
+        axis,
+        partial_func,
+        combine_func,
+        chunk_size=CHUNK_SIZE,
+        n_workers=None,
+        progress=None):
+    """
+    Reduce an array along an axis, streaming over its chunks in parallel.
+
+    The chunks are read sequentially (see `iter_chunks()`), so that the
+    data source is never accessed concurrently, and reduced by a pool of
+    threads.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        axis (int): The axis along which to reduce.
+        partial_func (callable): Reduce a chunk.
+            Must accept the chunk and the axis, and return a tuple of arrays
+            where the reduced axis is kept (with size 1).
+        combine_func (callable): Combine the reductions of two chunks.
+            Must accept and return tuples as those from `partial_func`.
+        chunk_size (int): The maximum size of the chunks in bytes.
+        n_workers (int|None): The number of threads.
+            If None, the number of CPUs is used.
+        progress (callable|None): Report the progress.
+            Must accept the number of reduced chunks and the total number
+            of chunks.
+
+    Returns:
+        result (tuple[np.ndarray]): The reduction.
+    """
+    if not 0 <= axis < arr.ndim:
+        text = 'Invalid axis `{}` for array of shape `{}`.'.format(
+            axis, arr.shape)
+        raise ValueError(text)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    chunk_axis_ = chunk_axis(arr)
+    step = _chunk_step(arr, chunk_size, chunk_axis_)
+    n_chunks = -(-arr.shape[chunk_axis_] // step)
+    shape = tuple(1 if i == axis else d for i, d in enumerate(arr.shape))
+    result = None
+    n_done = 0
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(n_workers) as pool:
+        chunks = itertools.chain(
+            iter_chunks(arr, chunk_size, chunk_axis_), [(None, None)])
+        for index, chunk in chunks:
+            if chunk is not None:
+                pending.append(
+                    (index, pool.submit(partial_func, chunk, axis)))
+            # : limit the chunks in memory to (about) one per thread,
+            #   and collect all of them after the last one
+            while len(pending) > n_workers or (pending and chunk is None):
+                index, future = pending.popleft()
+                partial = future.result()
+                if chunk_axis_ == axis:
+                    result = partial if result is None \
+                        else combine_func(result, partial)
+                else:
+                    if result is None:
+                        result = tuple(
+                            np.empty(shape, dtype=x.dtype) for x in partial)
+                    index = list(index)
+                    index[axis] = slice(None)
+                    for x, partial_x in zip(result, partial):
+                        x[tuple(index)] = partial_x
+                n_done += 1
+                if progress is not None:
+                    progress(n_done, n_chunks)
+    return result
+
+
+# ======================================================================
+def moments(
+        arr,
+        axis,
+        chunk_size=CHUNK_SIZE,
+        n_workers=None,
+        progress=None):
+    """
+    Compute the moments of an array along an axis, streaming over chunks.
+
+    Non-finite values are ignored.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        axis (int): The axis along which to compute the moments.
+        chunk_size (int): The maximum size of the chunks in bytes.
+        n_workers (int|None): The number of threads.
+            If None, the number of CPUs is used.
+        progress (callable|None): Report the progress.
+            See `_reduce_chunks()` for more info.
+
+    Returns:
+        result (tuple[np.ndarray]): The tuple
+            contains:
+             - count (np.ndarray): The number of values.
+             - mean (np.ndarray): The mean.
+             - m2 (np.ndarray): The sum of the squared deviations.
+            The reduced axis is kept (with size 1).
+    """
+    return _reduce_chunks(
+        arr, axis, _partial_moments, _combine_moments,
+        chunk_size, n_workers, progress)
+
+
+# ======================================================================
+def from_moments(moments_, reduction):
+    """
+    Compute the mean or the standard deviation from the moments.
+
+    Args:
+        moments_ (tuple[np.ndarray]): The moments.
+            See `moments()` for more info.
+        reduction (str): The reduction, either 'mean' or 'std'.
+
+    Returns:
+        result (np.ndarray): The reduction.
+
+    Raises:
+        ValueError: If the reduction is not supported.
+    """
+    count, mean, m2 = moments_
+    if reduction == 'mean':
+        return mean
+    elif reduction == 'std':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(m2 / count)
+    else:
+        text = 'Unsupported reduction `{}` from moments.'.format(reduction)
+        raise ValueError(text)
+
+
+# ======================================================================
+def projection(
+        arr,
+        axis,
+        reduction='max',
+        chunk_size=CHUNK_SIZE,
+        n_workers=None,
+        progress=None):
+    """
+    Compute the projection of an array along an axis, streaming over chunks.
+
+    Non-finite values are ignored.
+    For complex arrays, the extrema ('max' and 'min') are computed on the
+    magnitude.
+
+    Args:
+        arr (np.ndarray|LazyArray): The input array.
+        axis (int): The axis along which to project.
+        reduction (str): The reduction.
+            Accepted values are listed in `REDUCTIONS`:
+             - 'max': maximum (intensity) projection;
+             - 'mean': mean;
+             - 'std': (population) standard deviation;
+             - 'min': minimum (intensity) projection.
+        chunk_size (int): The maximum size of the chunks in bytes.
+        n_workers (int|None): The number of threads.
+            If None, the number of CPUs is used.
+        progress (callable|None): Report the progress.
+            See `_reduce_chunks()` for more info.
+
+    Returns:
+        result (np.ndarray): The projection.
+            The projected axis is kept (with size 1).
+
+    Raises:
+        ValueError: If the reduction is not supported.
+
+    Examples:
+        >>> arr = np.arange(24).reshape((2, 3, 4))
+        >>> projection(arr, 1, 'max')
+        array([[[ 8,  9, 10, 11]],
+        <BLANKLINE>
+               [[20, 21, 22, 23]]])
+        >>> projection(arr, 0, 'mean', chunk_size=8)[0, 0].tolist()
+        [6.0, 7.0, 8.0, 9.0]
+        >>> arr = np.random.random((5, 6, 7))
+        >>> all(
+        ...     np.allclose(
+        ...         projection(arr, axis, 'std', chunk_size=256),
+        ...         np.std(arr, axis=axis, keepdims=True))
+        ...     for axis in range(3))
+        True
+    """
+    if reduction in ('mean', 'std'):
+        return from_moments(
+            moments(arr, axis, chunk_size, n_workers, progress), reduction)
+    elif reduction in ('max', 'min'):
+        func = np.fmax if reduction == 'max' else np.fmin
+        return _reduce_chunks(
+            arr, axis,
+            lambda chunk, axis_: _partial_extremum(chunk, axis_, func),
+            lambda result, partial: (func(result[0], partial[0]),),
+            chunk_size, n_workers, progress)[0]
+    else:
+        text = 'Unsupported reduction `{}`.'.format(reduction)
+        raise ValueError(text)